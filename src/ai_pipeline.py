@@ -0,0 +1,102 @@
+"""CPU の思考を描画スレッドから切り離すパイプライン
+
+プレイヤーの手番が始まった時点で CPU の思考（AIPlayer.choose_card_index）を
+ワーカースレッドで開始し、Game.update_game は毎フレーム結果をポーリングするだけにする。
+E Card は両者が同時にカードを出すゲームなので、CPU の手はプレイヤーの選択を待たずに決められる。
+"""
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from player import AIPlayer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 0.5  # プレイヤーがカードを出してから CPU の手を待つ最大時間（秒）
+
+# 予算切れのときに使う即答の方策（基本戦略）
+FallbackPolicy = Callable[[AIPlayer], int]
+
+class AIMovePipeline:
+    """CPU の手をワーカースレッドで非同期に求める"""
+
+    def __init__(self, budget: float = DEFAULT_BUDGET,
+                 fallback: FallbackPolicy = AIPlayer.choose_card_index):
+        self.budget = budget
+        self.fallback = fallback
+        # ワーカーは1本: 打ち切った思考が終わるまで次の思考は始まらない。
+        # ただし打ち切った思考の実行中にメインスレッドでフォールバックが動くことはあるので、
+        # CPU には配布用の engine.rng を共有させず、専用の乱数を持たせること
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+        self.ai_player: Optional[AIPlayer] = None
+        self.future: Optional[Future] = None
+        self.deadline: Optional[float] = None
+        self.used_fallback = False  # 直前の手がフォールバックだったか
+
+    def start(self, ai_player: AIPlayer):
+        """手番の開始: CPU の思考をワーカースレッドで始める"""
+        self.ai_player = ai_player
+        self.future = self.executor.submit(ai_player.choose_card_index)
+        self.deadline = None
+        self.used_fallback = False
+
+    def commit(self):
+        """プレイヤーの手が決まった: ここから budget 秒以内に CPU の手を確定させる"""
+        if self.deadline is None:
+            self.deadline = time.perf_counter() + self.budget
+
+    @property
+    def thinking(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def poll(self) -> Optional[int]:
+        """CPU の手（手札の位置）が決まっていれば返す（まだなら None）
+
+        commit 後に budget を使い切った場合は思考を打ち切ってフォールバックの手を返す。
+        """
+        if self.future is None:
+            return None
+        if self.future.done():
+            future = self.future
+            self.future = None
+            error = future.exception()
+            if error is None:
+                return future.result()
+            # 思考の不具合（MCTS・ソルバーなど）を隠さないよう、記録してからフォールバックする
+            logger.error("CPU %s failed to choose a card, using the fallback policy",
+                         self.ai_player.name, exc_info=error)
+            return self._fallback()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            # 実行中の思考は止められないので、結果を捨てて即答の方策を使う
+            self.future.cancel()
+            self.future = None
+            return self._fallback()
+        return None
+
+    def wait(self) -> Optional[int]:
+        """CPU の手が決まるまで待って返す（描画しない早送り用。最大 budget 秒で打ち切る）"""
+        if self.future is None:
+            return None
+        self.commit()
+        try:
+            self.future.result(timeout=max(0.0, self.deadline - time.perf_counter()))
+        except Exception:
+            pass  # 打ち切り・思考の失敗は poll がフォールバックの手にする
+        return self.poll()
+
+    def _fallback(self) -> int:
+        # 打ち切ったワーカーがまだ ai_player を使っている場合がある（__init__ の注意を参照）
+        self.used_fallback = True
+        return self.fallback(self.ai_player)
+
+    def cancel(self):
+        """進行中の思考の結果を破棄する"""
+        if self.future is not None:
+            self.future.cancel()
+        self.future = None
+        self.deadline = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
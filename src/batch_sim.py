@@ -0,0 +1,133 @@
+"""NumPy による E Card バトルの一括シミュレーション
+
+N 個のバトルを整数配列（陣営ごとの市民の残り枚数・決着ターン）として同時に進め、
+勝敗は card.OUTCOME_TABLE（3x3 の勝敗表）を judge_batch で一括して引くだけで判定する。
+1 バトル = 皇帝側（皇帝1枚+市民4枚）と奴隷側（奴隷1枚+市民4枚）の5ターン以内の勝負。
+"""
+
+import sys
+import time
+from typing import Callable, Optional
+import numpy as np
+from card import CardType, judge_batch
+
+EMPEROR = CardType.EMPEROR.value
+CITIZEN = CardType.CITIZEN.value
+SLAVE = CardType.SLAVE.value
+
+CITIZENS = 4  # 初期の市民の枚数
+MAX_TURNS = CITIZENS + 1
+CHUNK_SIZE = 1 << 20  # 1 チャンクあたりのバトル数（メモリ使用量の上限）
+
+# 1ターン分の方策: 市民の残り枚数の配列を受け取り、特殊カード（皇帝/奴隷）を出す確率を返す。
+# 特殊カードを出した時点でバトルは決着するので、未決着のバトルでは必ず手札に残っている。
+Policy = Callable[[np.ndarray], np.ndarray]
+
+def ai_special_probability(citizens: np.ndarray) -> np.ndarray:
+    """AIPlayer.select_card_ai が特殊カードを選ぶ確率"""
+    citizens = citizens.astype(np.float64)
+    uniform = 1.0 / (citizens + 1.0)  # 手札からランダムに1枚選んだ場合
+    # 市民優先の分岐に入らなかった場合（皇帝/奴隷を30%、それ以外はランダム）
+    fallback = 0.3 + 0.7 * uniform
+    # 30%: 完全ランダム / 70%: 市民があれば50%で市民を選択、残りは fallback
+    probability = 0.3 * uniform + 0.7 * np.where(citizens > 0, 0.5 * fallback, fallback)
+    # 最後の1枚は選択の余地なし
+    return np.where(citizens > 0, probability, 1.0)
+
+class BatchResult:
+    """一括シミュレーションの集計結果"""
+
+    def __init__(self):
+        self.battles = 0
+        # turn_histogram[0]: 皇帝側勝利, [1]: 奴隷側勝利 の決着ターン別件数（添字 = ターン数）
+        self.turn_histogram = np.zeros((2, MAX_TURNS + 1), dtype=np.int64)
+
+    @property
+    def emperor_wins(self) -> int:
+        return int(self.turn_histogram[0].sum())
+
+    @property
+    def slave_wins(self) -> int:
+        return int(self.turn_histogram[1].sum())
+
+    @property
+    def emperor_win_rate(self) -> float:
+        return self.emperor_wins / self.battles if self.battles else 0.0
+
+    @property
+    def slave_win_rate(self) -> float:
+        return self.slave_wins / self.battles if self.battles else 0.0
+
+    def turn_length_histogram(self) -> np.ndarray:
+        """勝者を問わない決着ターン別件数"""
+        return self.turn_histogram.sum(axis=0)
+
+    def __repr__(self) -> str:
+        return (f"BatchResult(battles={self.battles}, "
+                f"emperor_win_rate={self.emperor_win_rate:.4f}, "
+                f"slave_win_rate={self.slave_win_rate:.4f})")
+
+def simulate_battles(n: int, seed: Optional[int] = None,
+                     emperor_policy: Policy = ai_special_probability,
+                     slave_policy: Policy = ai_special_probability,
+                     chunk_size: int = CHUNK_SIZE) -> BatchResult:
+    """n 個のバトルを同時に進めて集計する
+
+    チャンクごとに SeedSequence から独立した乱数ストリームを割り当てるため、
+    同じ seed と chunk_size なら結果は再現できる。
+    """
+    result = BatchResult()
+    num_chunks = (n + chunk_size - 1) // chunk_size
+    streams = np.random.SeedSequence(seed).spawn(num_chunks)
+    for i, stream in enumerate(streams):
+        size = min(chunk_size, n - i * chunk_size)
+        _simulate_chunk(size, np.random.default_rng(stream),
+                        emperor_policy, slave_policy, result)
+    return result
+
+def _simulate_chunk(size: int, rng: np.random.Generator,
+                    emperor_policy: Policy, slave_policy: Policy,
+                    result: BatchResult):
+    citizens = np.full(size, CITIZENS, dtype=np.int8)  # 両陣営の市民の残り枚数（常に同数）
+    end_turn = np.zeros(size, dtype=np.int8)  # 決着したターン
+    outcome = np.zeros(size, dtype=np.int8)  # 皇帝側から見た勝敗
+    active = np.arange(size)  # 未決着のバトルの添字
+
+    for turn in range(1, MAX_TURNS + 1):
+        if active.size == 0:
+            break
+        remaining = citizens[active]
+        rolls = rng.random((2, active.size))
+
+        # 各陣営のカードを選択し、結果表を引いて一括判定
+        emperor_cards = np.where(rolls[0] < emperor_policy(remaining), EMPEROR, CITIZEN)
+        slave_cards = np.where(rolls[1] < slave_policy(remaining), SLAVE, CITIZEN)
+        judged = judge_batch(emperor_cards, slave_cards)
+
+        decided = judged != 0
+        finished = active[decided]
+        outcome[finished] = judged[decided]
+        end_turn[finished] = turn
+
+        # 引き分け（市民同士）のバトルだけ次のターンへ
+        active = active[~decided]
+        citizens[active] -= 1
+
+    result.battles += size
+    result.turn_histogram[0] += np.bincount(end_turn[outcome > 0], minlength=MAX_TURNS + 1)
+    result.turn_histogram[1] += np.bincount(end_turn[outcome < 0], minlength=MAX_TURNS + 1)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    start = time.perf_counter()
+    result = simulate_battles(n, seed=0)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n} battles in {elapsed:.2f}s ({n / elapsed:,.0f} battles/s)")
+    print(result)
+    for turn, count in enumerate(result.turn_length_histogram()):
+        if turn > 0:
+            print(f"  turn {turn}: {count}")
+
+if __name__ == "__main__":
+    main()
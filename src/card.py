@@ -5,14 +5,50 @@ class CardType(Enum):
     CITIZEN = 1  # 市民
     SLAVE = 2    # 奴隷
 
+WIN = 1
+DRAW = 0
+LOSE = -1
+
+# 勝敗表（行: 自分のカード, 列: 相手のカード, CardType.value 順）
+# ルールはこの表にだけ書き、判定は全てここを引く
+OUTCOME_TABLE = (
+    (DRAW, WIN, LOSE),   # 皇帝: 市民に勝つ、奴隷に負ける
+    (LOSE, DRAW, WIN),   # 市民: 奴隷に勝つ、皇帝に負ける
+    (WIN, LOSE, DRAW),   # 奴隷: 皇帝に勝つ、市民に負ける
+)
+
+# Game.judge_cards などが返す文字列版の勝敗表
+RESULT_NAMES = {WIN: "win", DRAW: "draw", LOSE: "lose"}
+RESULT_TABLE = tuple(tuple(RESULT_NAMES[outcome] for outcome in row) for row in OUTCOME_TABLE)
+
+_numpy_table = None
+
+def judge(card_type1: CardType, card_type2: CardType) -> int:
+    """card_type1 から見た勝敗（WIN / DRAW / LOSE）"""
+    # Enum の .value はプロパティ経由で遅いため _value_ を直接参照する
+    return OUTCOME_TABLE[card_type1._value_][card_type2._value_]
+
+def judge_name(card_type1: CardType, card_type2: CardType) -> str:
+    """card_type1 から見た勝敗（"win" / "draw" / "lose"）"""
+    return RESULT_TABLE[card_type1._value_][card_type2._value_]
+
+def judge_batch(first, second):
+    """CardType.value の配列同士をまとめて判定する
+
+    numpy 配列を渡した場合は表を一度に引いて numpy 配列（int8）を返す。
+    numpy は必要になったときに初めて import する。
+    """
+    global _numpy_table
+    if hasattr(first, "dtype") or hasattr(second, "dtype"):
+        if _numpy_table is None:
+            import numpy as np
+            _numpy_table = np.array(OUTCOME_TABLE, dtype=np.int8)
+        return _numpy_table[first, second]
+    return [OUTCOME_TABLE[a][b] for a, b in zip(first, second)]
+
 class Card:
     def __init__(self, card_type: CardType):
         self.card_type = card_type
         
     def is_stronger_than(self, other_card):
-        if self.card_type == CardType.EMPEROR:
-            return other_card.card_type == CardType.CITIZEN
-        elif self.card_type == CardType.CITIZEN:
-            return other_card.card_type == CardType.SLAVE
-        else:  # SLAVE
-            return other_card.card_type == CardType.EMPEROR
\ No newline at end of file
+        return judge(self.card_type, other_card.card_type) == WIN
@@ -0,0 +1,185 @@
+import random
+from typing import Iterable, List, Optional, Type
+from card import Card, CardType, judge_name
+from hand import Hand
+from match_log import MatchRecord
+from player import Player, AIPlayer
+
+class MatchEngine:
+    """E Card の対戦ルール（pyxel に依存しない）
+
+    描画・音声・入力は Game 側が担当し、こちらは手札の配布、勝敗判定、
+    バトル数・ターン数の管理のみを行う。seed を指定すると配布が再現可能になる。
+    配った手札の並び順と各ターンに出したカードの位置は record に記録される。
+    """
+
+    def __init__(self, total_battles: int = 6, seed: Optional[int] = None):
+        self.total_battles = total_battles  # 全6戦
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.record = MatchRecord(seed, total_battles)
+        self.replay_deals = None  # リプレイ中は記録された並び順で配る
+        self.player: Optional[Player] = None
+        self.ai_player: Optional[AIPlayer] = None
+        self.player_card: Optional[Card] = None
+        self.ai_card: Optional[Card] = None
+        self.round = 1  # 現在のターン数
+        self.current_battle = 1  # 現在の戦数
+        self.player_is_emperor = True  # プレイヤーが皇帝側かどうか
+        self.played_cards_history = []  # 場に出たカードの履歴
+        self.battle_result = None  # "win" / "lose"（プレイヤー視点）
+        self.finished = False
+
+    def start(self, player: Player, ai_player: AIPlayer, seed: Optional[int] = None,
+              deals: Optional[Iterable[Iterable[int]]] = None):
+        """対戦を開始（プレイヤーは皇帝側からスタート）
+
+        seed を指定すると乱数を初期化し直す。deals を指定すると手札をシャッフルせず、
+        その並び順で配る（リプレイ用）。
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        self.record = MatchRecord(self.seed, self.total_battles)
+        self.replay_deals = iter(deals) if deals is not None else None
+        self.player = player
+        self.ai_player = ai_player
+        self.player_card = None
+        self.ai_card = None
+        self.round = 1
+        self.current_battle = 1
+        self.player_is_emperor = True
+        self.played_cards_history = []
+        self.battle_result = None
+        self.finished = False
+
+        self.player.score = 0
+        self.ai_player.score = 0
+        self.deal()
+
+    def deal(self):
+        """両陣営に新しい手札を配布"""
+        self.player.hand = self.init_cards(self.player_is_emperor)
+        self.ai_player.hand = self.init_cards(not self.player_is_emperor)
+
+    def init_cards(self, is_emperor: bool) -> Hand:
+        """陣営に応じたカードを初期化"""
+        cards = []
+        if is_emperor:
+            cards.append(CardType.EMPEROR)  # 皇帝1枚
+        else:
+            cards.append(CardType.SLAVE)  # 奴隷1枚
+        cards.extend([CardType.CITIZEN] * 4)  # 市民4枚
+        order = self.deal_order(len(cards))
+        return Hand.from_types([cards[i] for i in order])
+
+    def deal_order(self, size: int) -> List[int]:
+        """配る手札の並び順（シャッフル結果）を決めて記録する"""
+        if self.replay_deals is not None:
+            deal = next(self.replay_deals, None)
+            if deal is None:
+                raise ValueError(f"match record has no deal for battle {self.current_battle}")
+            order = list(deal)
+        else:
+            order = list(range(size))
+            self.rng.shuffle(order)
+        self.record.deals.append(tuple(order))
+        return order
+
+    def play_card(self, card_index: int, ai_card_index: Optional[int] = None) -> Optional[str]:
+        """プレイヤーが手札の card_index 番目を出し、CPU が応じる
+
+        ai_card_index を指定すると、CPU はその位置のカードを出す（非同期に思考した結果など）。
+        """
+        if not self.player or not self.ai_player:
+            return None
+
+        if not 0 <= card_index < len(self.player.hand):
+            return None
+
+        if ai_card_index is None:
+            ai_card_index = self.ai_player.choose_card_index()
+        if not 0 <= ai_card_index < len(self.ai_player.hand):
+            # 壊れた記録などで CPU の位置が手札の外なら、何も記録せず出さない
+            return None
+        self.record.moves.append((card_index, ai_card_index))
+        player_card = self.player.select_card(card_index)
+        return self.play_turn(player_card, self.ai_player.select_card(ai_card_index))
+
+    def play_turn(self, player_card: Card, ai_card: Optional[Card] = None) -> Optional[str]:
+        """1ターン分の勝負を行い、プレイヤー視点の結果を返す
+
+        ai_card を省略すると CPU が自分で選択する。
+        """
+        self.player_card = player_card
+        self.ai_card = ai_card if ai_card is not None else self.ai_player.select_card_ai()
+
+        if not self.player_card or not self.ai_card:
+            return None
+
+        # 履歴に追加し、CPU には相手の出したカードを知らせる
+        self.played_cards_history.append((self.player_card, self.ai_card))
+        self.ai_player.observe_turn(self.ai_card, self.player_card)
+        if isinstance(self.player, AIPlayer):
+            self.player.observe_turn(self.player_card, self.ai_card)
+
+        # 勝敗判定
+        result = self.judge_cards(self.player_card, self.ai_card)
+        if result == "win":
+            self.player.score += 1
+            self.battle_result = result
+        elif result == "lose":
+            self.ai_player.score += 1
+            self.battle_result = result
+        else:  # 引き分けの場合
+            self.round += 1
+        return result
+
+    @staticmethod
+    def judge_cards(card1: Card, card2: Card) -> str:
+        """カードの勝敗判定"""
+        return judge_name(card1.card_type, card2.card_type)
+
+    def is_emperor_vs_slave(self) -> bool:
+        """皇帝vs奴隷の判定"""
+        return ((self.player_card.card_type == CardType.EMPEROR and
+                self.ai_card.card_type == CardType.SLAVE) or
+               (self.player_card.card_type == CardType.SLAVE and
+                self.ai_card.card_type == CardType.EMPEROR))
+
+    def next_battle(self) -> bool:
+        """次の戦へ移行（全戦終了なら False を返す）"""
+        # 場のカードをリセット
+        self.player_card = None
+        self.ai_card = None
+        self.battle_result = None
+
+        self.current_battle += 1
+        if self.current_battle > self.total_battles:
+            self.finished = True
+            return False
+
+        # 陣営を交代して新しい手札を配布
+        self.player_is_emperor = not self.player_is_emperor
+        self.deal()
+        self.round = 1
+        return True
+
+def simulate_match(seed: Optional[int] = None,
+                   player_cls: Type[AIPlayer] = AIPlayer,
+                   opponent_cls: Type[AIPlayer] = AIPlayer,
+                   total_battles: int = 6) -> MatchEngine:
+    """CPU 同士の対戦を1試合分ヘッドレスで実行する
+
+    配布も両 CPU の選択も engine.rng を共有するため、同じ seed なら同じ試合になる。
+    """
+    engine = MatchEngine(total_battles, seed)
+    player = player_cls("CPU 1", rng=engine.rng)
+    opponent = opponent_cls("CPU 2", rng=engine.rng)
+    engine.start(player, opponent)
+
+    while not engine.finished:
+        engine.play_card(player.choose_card_index())
+        if engine.battle_result is not None:
+            engine.next_battle()
+    return engine
@@ -1,9 +1,30 @@
+import os
+import random
+import time
 import pyxel
 from enum import Enum
 from player import Player, AIPlayer, PlayerType
 from card import Card, CardType
-import random
-from typing import List
+from engine import MatchEngine
+from match_log import MatchRecord
+from overlay import DitherOverlay
+from scene import RetainedScene
+from layout import TextLayout
+from timestep import FixedTimestep
+from sound_bank import SoundBank
+from tween import TweenPool, LINEAR, FADE_LEVELS
+from sprites import CardAtlas, DrawCallCounter, CARD_BACK, draw_card_face, draw_card_back_face
+from hand import Hand
+from lazy import lazy_import, unicode_font
+
+# タイトル画面では使わないもの（CPU の思考・学習、フレーム時間の計測）は最初に使うときに読み込む
+ai_pipeline_module = lazy_import("ai_pipeline")
+opponent_model_module = lazy_import("opponent_model")
+profiler_module = lazy_import("profiler")
+mcts_module = lazy_import("mcts")
+
+# 対戦相手の CPU の戦略（main.py の --cpu で選ぶ）
+CPU_STRATEGIES = ("basic", "mcts")
 
 class GameMode(Enum):
     PVP = 0  # Player vs Player
@@ -15,105 +36,286 @@ class GameState(Enum):
     PLAYING = 2
     RESULT = 3
 
+TITLE_SUBTITLE = "皇帝と奴隷"
+# pyxelunicode で描く文字列（最初のフレームの後にバックグラウンドでラスタライズしておく）
+UNICODE_TEXTS = (TITLE_SUBTITLE,)
+
+# 操作に使うキー（固定タイムステップでは毎フレーム調べて、次の tick まで持ち越す）
+INPUT_KEYS = (pyxel.KEY_Q, pyxel.KEY_SPACE, pyxel.KEY_LEFT, pyxel.KEY_RIGHT,
+              pyxel.KEY_UP, pyxel.KEY_DOWN)
+
+REPLAY_STEP_FRAMES = 30  # 等速再生で1手進める間隔（フレーム数）
+MAX_SAVED_RECORDS = 50  # 保存しておく試合の記録の数
+# アニメーションの種類（TweenPool の kind）と長さ（tick 数）
+TWEEN_PLAY = 1   # 出したカードが場に移動する（key 0: プレイヤー, 1: CPU）
+TWEEN_FLIP = 2   # CPU のカードを裏返す
+TWEEN_POPUP = 3  # 決着のポップアップのフェードイン
+TWEEN_DEAL = 4   # 手札を配る（key i: プレイヤーの i 枚目, CPU_DEAL_KEY + i: CPU の i 枚目）
+CPU_DEAL_KEY = 8
+SLIDE_TICKS = 8
+FLIP_TICKS = 6
+POPUP_FADE_TICKS = 6
+DEAL_TICKS = 8
+DEAL_STAGGER_TICKS = 2  # 配るカード1枚ごとの開始の遅れ
+PLAYED_CARD_WIDTH = 25
+PLAYED_CARD_HEIGHT = 35
+DEMO_TURN_TICKS = 45  # デモでカードを出すまでの間（tick 数）
+DEMO_PAUSE_TICKS = 90  # デモで決着・試合結果を見せる間（tick 数）
+
 class Game:
-    def __init__(self, width: int, height: int):
-        pyxel.init(width, height, title="E CARD GAME")
+    def __init__(self, width: int, height: int, scale: int = 1):
+        # width, height は論理解像度。scale 倍の大きさのウィンドウに整数倍で拡大して表示する
+        pyxel.init(width * scale, height * scale, title="E CARD GAME")
         self.width = width
         self.height = height
+        self.scale = scale
         # カードサイズを定数として定義
         self.CARD_WIDTH = 28
         self.CARD_HEIGHT = 38
         self.CARD_SPACING = 4
+        # 文字列の幅・中央揃えの位置のキャッシュ
+        self.layout = TextLayout(width, height)
+        # 論理解像度の描画先（拡大するときはオフスクリーンの画像に描いてから拡大して転送する）
+        self.screen = pyxel if scale == 1 else pyxel.Image(width, height)
+        # 描画先（描画呼び出しを数えるときは DrawCallCounter に差し替える）
+        self.gfx = self.screen
+        # フレーム時間の計測（enable_profiler で有効にしたときだけ）
+        self.profiler = None
+        self.profile_path = None
+        # カードの絵とポップアップの背景を暗くするレイヤーは起動時に一度だけ作る
+        self.card_atlas = CardAtlas()
+        self.dither_overlay = DitherOverlay(width, height)
         
         self.game_state = GameState.TITLE
         self.game_mode = None
-        self.player = None
-        self.ai_player = None
+        # ルール・手札・バトル数/ターン数は MatchEngine が管理する
+        self.engine = MatchEngine(total_battles=6)  # 全6戦
         self.selected_card_index = 0
-        self.player_card = None
-        self.ai_card = None
-        self.round = 1  # ラウンド数を追加
-        self.played_cards_history = []  # 場に出たカードの履歴
+        self.cpu = "basic"  # 対戦相手の CPU の戦略（CPU_STRATEGIES のどれか）
+        # CPU の思考はワーカースレッドで行い、描画を止めない（スレッドは最初の対戦で作る）
+        self._ai_pipeline = None
+        self.pending_card_index = None  # CPU の手を待っているプレイヤーのカード
+        # プレイヤーの癖の学習結果（起動を遅らせないよう最初の対戦開始時に読み込む）
+        self.opponent_model = None
+        # リプレイ再生中の記録と再生位置
+        self.replay_record = None
+        self.replay_index = 0
+        self.saved_record = None  # 保存済みの試合の記録（終了時に同じ試合を二重に保存しない）
+        self.replay_speed = 1.0
+        self.replay_clock = 0.0
+        # 固定タイムステップで状態を進める場合のループ制御（None なら update/draw を交互に呼ぶ）
+        self.timestep = None
+        self.pressed_keys = set()  # 固定タイムステップで、まだ tick に渡していない押されたキー
+        self.fast_forward = False  # run_ticks 中は CPU の思考を待ってから進める
+        # カードの移動などのアニメーション（動いている間は入力を受け付けない）
+        self.tweens = TweenPool()
+        # デモ（プレイヤー側も CPU が操作する）
+        self.demo = False
+        self.demo_wait = 0
         self.rounds_to_win = 3  # 3ラウンド先取で勝利
         self.current_round_winner = None
-        self.total_battles = 6  # 全6戦
-        self.current_battle = 1  # 現在の戦数
-        self.player_is_emperor = True  # プレイヤーが皇帝側かどうか
         self.show_result_popup = False
-        self.battle_result = None  # "win" or "lose"
         self.selected_mode = 0  # 選択中のモード（0: PVP, 1: PVE）を追加
-        self.init_sound()
-        
+        # マルチバイト文字のフォント（起動を遅らせないよう最初のフレームの後に読み込む）
+        self.unicode = None
+        self.unicode_layout = None  # self.unicode で描く文字列の幅・位置のキャッシュ
+        self.unicode_loaded = False
+        # 効果音と BGM（事前に変換したバンクを初めて鳴らすときに読み込む）
+        self.sounds = SoundBank()
+        self.init_scene()
+        
+    # 対戦状態は MatchEngine に委譲（描画側からは従来通りの名前で参照する）
+    @property
+    def player(self) -> Player:
+        return self.engine.player
+
+    @property
+    def ai_player(self) -> AIPlayer:
+        return self.engine.ai_player
+
+    @property
+    def player_card(self) -> Card:
+        return self.engine.player_card
+
+    @property
+    def ai_card(self) -> Card:
+        return self.engine.ai_card
+
+    @property
+    def round(self) -> int:
+        return self.engine.round
+
+    @property
+    def played_cards_history(self) -> list:
+        return self.engine.played_cards_history
+
+    @property
+    def total_battles(self) -> int:
+        return self.engine.total_battles
+
+    @property
+    def current_battle(self) -> int:
+        return self.engine.current_battle
+
+    @property
+    def player_is_emperor(self) -> bool:
+        return self.engine.player_is_emperor
+
+    @property
+    def battle_result(self) -> str:
+        return self.engine.battle_result
+
+    @property
+    def ai_pipeline(self) -> "ai_pipeline_module.AIMovePipeline":
+        if self._ai_pipeline is None:
+            self._ai_pipeline = ai_pipeline_module.AIMovePipeline()
+        return self._ai_pipeline
+
     def init_game(self):
-        # 音楽とサウンドの初期化
-        self.init_sound()
+        # 音楽とサウンドはサウンドバンクから初めて鳴らすときに読み込む
         # その他の初期化処理
-        
-    def init_sound(self):
-        # タイトル画面のBGM (sound 0)
-        pyxel.sounds[0].set(
-            "e2e3e2e3 g2g3g2g3",  # notes
-            "s",                   # tone
-            "4444 4444",          # volume
-            "n",                   # effect
-            20                     # speed
-        )
-        
-        # ゲーム中のざわざわBGM (sound 1)
-        pyxel.sounds[1].set(
-            "c2c#2d2d#2 e2f2f#2g2",  # 半音階で不安感を演出
-            "n",                      # ノイズ音
-            "4",                      # volume
-            "s",                      # サステイン効果
-            30                        # speed
-        )
-        
-        # カード選択音 (sound 2)
-        pyxel.sounds[2].set(
-            "c3",                     # notes
-            "p",                      # パルス波
-            "7",                      # volume
-            "n",                      # effect
-            15                        # speed
-        )
-        
-        # 勝利ファンファーレ (sound 3)
-        pyxel.sounds[3].set(
-            "c3e3g3c4",              # メジャーコード
-            "s",                      # サイン波
-            "6",                      # volume
-            "n",                      # effect
-            10                        # speed
-        )
-        
-        # 敗北音 (sound 4)
-        pyxel.sounds[4].set(
-            "f3d3b2g2",              # 下降音
-            "n",                      # ノイズ
-            "6",                      # volume
-            "f",                      # フェード効果
-            15                        # speed
-        )
+        pass
         
     def run(self):
-        pyxel.run(self.update, self.draw)
+        try:
+            pyxel.run(self.update, self.draw)
+        finally:
+            if self._ai_pipeline is not None:
+                self.ai_pipeline.shutdown()
+            if self.unicode is not None:
+                self.unicode.close()
+            self.save_session()
+        
+    def enable_fixed_timestep(self, time_scale: float = 1.0):
+        """状態を固定の tick で進め、描画が遅いときは描画を飛ばす（time_scale 倍速で進める）"""
+        self.timestep = FixedTimestep(time_scale=time_scale)
+        
+    def btnp(self, key: int) -> bool:
+        if self.timestep is None:
+            return pyxel.btnp(key)
+        return key in self.pressed_keys
         
     def update(self):
-        if pyxel.btnp(pyxel.KEY_Q):
+        if self.timestep is None:
+            self.step()
+            return
+        # tick が進まないフレームに押されたキーも取りこぼさないよう、入力は毎フレーム調べて貯めておく
+        self.pressed_keys.update(key for key in INPUT_KEYS if pyxel.btnp(key))
+        # 経過時間に相当する tick だけ状態を進める（入力は最初の tick だけで扱う）
+        for _ in range(self.timestep.advance()):
+            self.step()
+            self.pressed_keys.clear()
+        
+    def run_ticks(self, ticks: int):
+        """描画せずに状態を ticks 回進める（自動テスト・デモの早送り用）"""
+        self.fast_forward = True
+        try:
+            for _ in range(ticks):
+                self.step()
+                self.pressed_keys.clear()
+        finally:
+            self.fast_forward = False
+        
+    def step(self):
+        """状態を1 tick 進める"""
+        if self.btnp(pyxel.KEY_Q):
+            self.save_session()
             pyxel.quit()
+        
+        self.tweens.update()
             
         if self.game_state == GameState.TITLE:
             self.update_title()
         elif self.game_state == GameState.MODE_SELECT:
             self.update_mode_select()
         elif self.game_state == GameState.PLAYING:
-            self.update_game()
+            if self.replay_record is not None:
+                self.update_replay()
+            else:
+                self.update_game()
         elif self.game_state == GameState.RESULT:
             self.update_result()
             
+    def enable_draw_stats(self):
+        """1フレームあたりの描画呼び出しの数を画面左上に表示する"""
+        self.gfx = DrawCallCounter(self.screen)
+        
+    def enable_profiler(self, csv_path: str = None):
+        """update/draw の各フェーズと CPU の思考の時間を計測し、グラフを画面右上に表示する
+
+        csv_path を指定すると終了時に直近のフレームの計測値を書き出す。
+        """
+        self.profiler = profiler_module.FrameProfiler()
+        self.profile_path = csv_path
+        names = [name for name in dir(self)
+                 if name in ("update", "draw") or name.startswith(("update_", "draw_"))]
+        self.profiler.instrument(self, names, frame_method="update")
+        if self.engine.ai_player is not None:
+            self.profiler.instrument(self.ai_player, ("select_card_ai", "choose_card_index"), prefix="ai.")
+        # グラフは毎フレーム描き直す
+        self.scene.add_region((self.width - profiler_module.GRAPH_WIDTH, 0,
+                               profiler_module.GRAPH_WIDTH, profiler_module.GRAPH_HEIGHT + 8),
+                              lambda: self.profiler.frame)
+        
+    def init_scene(self):
+        """状態が変わった範囲だけ描き直すための範囲の登録"""
+        self.scene = RetainedScene(self.width, self.height)
+        # 画面の切り替え・ポップアップの表示・新しい試合は画面全体を描き直す
+        # アニメーション中は毎 tick 描き直す
+        self.scene.set_scene_key(lambda: (self.game_state, self.show_result_popup,
+                                          self.selected_mode, id(self.engine.player),
+                                          self.tweens.version))
+        # 対戦画面の各範囲（draw_game の配置に合わせる）
+        self.scene.add_region((0, 0, self.width, 30), lambda: (
+            self.current_battle, self.round,
+            self.ai_player and (self.ai_player.score, self.ai_player.get_hand_size())))
+        self.scene.add_region((0, 30, self.width, self.CARD_HEIGHT),
+                              lambda: self.ai_player and len(self.ai_player.hand))
+        self.scene.add_region((0, self.height // 2 - 50, self.width, 105),
+                              lambda: (self.player_card, self.ai_card))
+        self.scene.add_region((self.width - 50, self.height - self.CARD_HEIGHT - 60, 50, 24),
+                              lambda: self.player and (self.player.score, self.player.get_hand_size()))
+        self.scene.add_region((0, self.height - self.CARD_HEIGHT - 25, self.width, self.CARD_HEIGHT + 5),
+                              lambda: (self.player and self.player.hand, self.selected_card_index))
+        # タイトルの日本語は文字が揃ったら描き直す
+        self.scene.add_region((0, self.height // 2 + 24, self.width, 12),
+                              lambda: self.unicode is not None and self.unicode.ready(TITLE_SUBTITLE))
+        # 描画呼び出しの数の表示
+        self.scene.add_region((0, 0, 100, 7), lambda: getattr(self.gfx, "last_frame", None))
+        
     def draw(self):
-        pyxel.cls(0)
+        if self.timestep is not None:
+            # 固定タイムステップでは、描画が遅れているフレームは描かずに状態だけ進める
+            if not self.timestep.should_draw():
+                return
+            start = time.perf_counter()
+            self.render()
+            self.timestep.draw_finished(time.perf_counter() - start)
+        else:
+            self.render()
+            
+    def render(self):
+        # 変化した範囲だけ描き直す（何も変わっていなければ何もしない）
+        if not self.scene.render(self.gfx, self.draw_scene):
+            return
         
+        if isinstance(self.gfx, DrawCallCounter):
+            self.gfx.end_frame()
+            # 表示自体は数えない
+            self.screen.text(1, 1, self.layout.format("draw_calls", "DRAW CALLS: {}", self.gfx.last_frame), 10)
+        if self.profiler is not None:
+            self.profiler.draw(self.screen, self.width - profiler_module.GRAPH_WIDTH, 0)
+        if self.scale > 1:
+            self.present()
+            
+    def present(self):
+        """論理解像度の画像をウィンドウ全体に整数倍で拡大して転送する"""
+        # blt の scale は転送範囲の中心を基準に拡大するので、中心がウィンドウの中心に来る位置に置く
+        offset_x = self.width * (self.scale - 1) / 2
+        offset_y = self.height * (self.scale - 1) / 2
+        pyxel.blt(offset_x, offset_y, self.screen, 0, 0, self.width, self.height, scale=self.scale)
+            
+    def draw_scene(self):
         if self.game_state == GameState.TITLE:
             self.draw_title()
         elif self.game_state == GameState.MODE_SELECT:
@@ -123,152 +325,301 @@ class Game:
         elif self.game_state == GameState.RESULT:
             self.draw_result()
             
+    def load_unicode_font(self):
+        """マルチバイト文字のフォントを読み込み、画面で使う文字列をバックグラウンドでラスタライズする"""
+        self.unicode_loaded = True
+        self.unicode = unicode_font()
+        if self.unicode is not None:
+            self.unicode.prewarm(UNICODE_TEXTS)
+            self.unicode_layout = TextLayout(self.width, self.height, self.unicode)
+            
     def update_title(self):
-        if pyxel.btnp(pyxel.KEY_SPACE):
+        if not self.unicode_loaded and pyxel.frame_count > 0:
+            self.load_unicode_font()
+        if self.btnp(pyxel.KEY_SPACE):
             self.game_state = GameState.MODE_SELECT
-            pyxel.playm(0, loop=True)  # タイトルBGM開始
+            self.sounds.playm(0, loop=True)  # タイトルBGM開始
             
     def draw_title(self):
         # タイトルテキストと開始案内
         title_text = "E CARD GAME"
         start_text = "PRESS SPACE TO START"
         
-        # 1文字4ピクセルとして幅を計算
-        title_width = len(title_text) * 4
-        start_width = len(start_text) * 4
-        
-        # 両方のテキストを中央揃えで配置
-        title_x = (self.width - title_width) // 2
-        start_x = (self.width - start_width) // 2
+        # 両方のテキストを中央揃えで配置（位置は layout が一度だけ計算する）
+        title_x = self.layout.center_x(title_text)
+        start_x = self.layout.center_x(start_text)
         
         # タイトルを描画（開始案内の上に配置）
-        pyxel.text(title_x, self.height // 2 - 10, title_text, 7)
+        self.gfx.text(title_x, self.height // 2 - 10, title_text, 7)
         # 開始案内を描画
-        pyxel.text(start_x, self.height // 2 + 10, start_text, 7)
+        self.gfx.text(start_x, self.height // 2 + 10, start_text, 7)
+        # サブタイトル（フォントが無い環境や、文字のラスタライズが終わるまでは描かない）
+        # 幅は揃った文字で測るので、ready になってから layout に計算させる
+        if self.unicode is not None and self.unicode.ready(TITLE_SUBTITLE):
+            subtitle_x = self.unicode_layout.center_x(TITLE_SUBTITLE)
+            self.unicode.text(subtitle_x, self.height // 2 + 26, TITLE_SUBTITLE, 6, target=self.gfx)
 
-    def init_cards(self, is_emperor: bool) -> List[Card]:
+    def init_cards(self, is_emperor: bool) -> Hand:
         """陣営に応じたカードを初期化"""
-        cards = []
-        if is_emperor:
-            cards.append(Card(CardType.EMPEROR))  # 皇帝1枚
-            cards.extend([Card(CardType.CITIZEN) for _ in range(4)])  # 市民4枚
-        else:
-            cards.append(Card(CardType.SLAVE))  # 奴隷1枚
-            cards.extend([Card(CardType.CITIZEN) for _ in range(4)])  # 市民4枚
-        random.shuffle(cards)
-        return cards
+        return self.engine.init_cards(is_emperor)
 
     def start_game(self, mode: GameMode):
         self.game_mode = mode
         self.game_state = GameState.PLAYING
         self.selected_card_index = 0
-        self.player_card = None
-        self.ai_card = None
-        self.round = 1
-        
-        # プレイヤーの初期化（最初は皇帝側）
-        self.player = Player("Player 1", PlayerType.HUMAN)
-        self.player.hand = self.init_cards(self.player_is_emperor)
-        
-        # AIプレイヤーの初期化（最初は奴隷側）
-        self.ai_player = AIPlayer("CPU")
-        self.ai_player.hand = self.init_cards(not self.player_is_emperor)
-        
-        # スコアの初期化
-        self.player.score = 0
-        self.ai_player.score = 0
-        
-        pyxel.playm(1, loop=True)  # ゲーム中BGM開始
-        
-    def play_card(self, card_index: int):
-        if not self.player or not self.ai_player:
+        self.pending_card_index = None
+        self.show_result_popup = False
+        self.demo_wait = 0
+        
+        # 試合はリプレイできるよう seed と手順を記録する
+        seed = random.getrandbits(63)
+        # プレイヤーは最初は皇帝側、AIプレイヤーは奴隷側
+        # CPU の思考はワーカースレッドで動くので、配布用の engine.rng とは別の乱数を持たせる
+        # （同じ seed からは同じ CPU になる）
+        ai_player = self.new_cpu("CPU", random.Random(seed + 1))
+        if self.demo:
+            # デモではプレイヤー側も CPU が操作する（学習はしない）
+            player = AIPlayer("Player 1", rng=random.Random(seed + 2))
+        else:
+            player = Player("Player 1", PlayerType.HUMAN)
+            ai_player.opponent_model = self.load_opponent_model()
+        self.engine.start(player, ai_player, seed=seed)
+        if self.profiler is not None:
+            self.profiler.instrument(ai_player, ("select_card_ai", "choose_card_index"), prefix="ai.")
+        self.start_ai_turn()  # 最初の手番の思考を開始
+        self.tweens.clear()
+        self.animate_deal()
+        
+        self.sounds.playm(1, loop=True)  # ゲーム中BGM開始
+        
+    def new_cpu(self, name: str, rng: random.Random) -> AIPlayer:
+        """self.cpu の戦略の CPU を作る"""
+        if self.cpu == "mcts":
+            return mcts_module.MCTSPlayer(name, rng=rng)
+        return AIPlayer(name, rng=rng)
+        
+    def start_demo(self):
+        """CPU 同士の対戦を繰り返し見せるデモ（アトラクトモード）を始める"""
+        self.demo = True
+        self.start_game(GameMode.PVE)
+        
+    def demo_elapsed(self, ticks: int) -> bool:
+        """デモ中に ticks だけ待ったら True（デモでなければ常に False）"""
+        if not self.demo:
+            return False
+        self.demo_wait += 1
+        if self.demo_wait < ticks:
+            return False
+        self.demo_wait = 0
+        return True
+        
+    def start_replay(self, record: MatchRecord, speed: float = 1.0):
+        """記録した試合を speed 倍速で再生する"""
+        self.game_mode = GameMode.PVE
+        self.game_state = GameState.PLAYING
+        self.selected_card_index = 0
+        self.pending_card_index = None
+        self.show_result_popup = False
+        self.replay_record = record
+        self.replay_index = 0
+        self.replay_speed = speed
+        self.replay_clock = 0.0
+        
+        # CPU は思考せず、記録された位置のカードを出す
+        player = Player("Player 1", PlayerType.HUMAN)
+        ai_player = AIPlayer("CPU")
+        self.engine.start(player, ai_player, seed=record.seed, deals=record.deals)
+        self.tweens.clear()
+        self.animate_deal()
+        
+        self.sounds.playm(1, loop=True)
+        
+    def update_replay(self):
+        """記録された手順を replay_speed 倍速で進める"""
+        if self.tweens.busy:
+            return  # アニメーションが終わるまで次の手に進まない
+        self.replay_clock += self.replay_speed
+        while self.replay_clock >= REPLAY_STEP_FRAMES and self.game_state == GameState.PLAYING:
+            self.replay_clock -= REPLAY_STEP_FRAMES
+            more_moves = self.replay_index < len(self.replay_record.moves)
+            if self.show_result_popup and (more_moves or self.current_battle == self.total_battles):
+                self.show_result_popup = False
+                self.next_battle()
+            elif not self.show_result_popup and more_moves:
+                card_index, ai_card_index = self.replay_record.moves[self.replay_index]
+                self.replay_index += 1
+                self.selected_card_index = card_index
+                self.play_card(card_index, ai_card_index)
+            else:
+                # 途中で終わった記録はタイトルに戻る（決着の直後で終わった記録は次の配布がない）
+                self.show_result_popup = False
+                self.replay_record = None
+                self.game_state = GameState.TITLE
+                pyxel.stop()
+        
+    def start_ai_turn(self):
+        """CPU の思考を開始（リプレイ中は記録された手を使うので思考しない）"""
+        if self.replay_record is None:
+            self.ai_pipeline.start(self.ai_player)
+        
+    def save_session(self):
+        """学習結果と対戦中の試合の記録（計測中ならフレーム時間）を保存する"""
+        if self.opponent_model is not None:
+            self.opponent_model.save()
+        if self.profiler is not None and self.profile_path:
+            self.profiler.save_csv(self.profile_path)
+        if self.game_state == GameState.PLAYING:
+            self.save_match_record()
+
+    def save_match_record(self):
+        """試合の記録を保存する（不具合の再現用。古いものから削除する）"""
+        if self.replay_record is not None or not self.engine.record.moves:
             return
-            
-        if card_index >= len(self.player.hand):
+        if self.demo:
+            # デモの試合を残すと、放っておくだけでプレイヤーの記録が古い順に消されてしまう
             return
-            
-        # プレイヤーのカードプレイ
-        self.player_card = self.player.select_card(card_index)
-        self.ai_card = self.ai_player.select_card_ai()
-        
-        if self.player_card and self.ai_card:
-            # 履歴に追加
-            self.played_cards_history.append((self.player_card, self.ai_card))
-            
-            # 勝敗判定
-            result = self.judge_cards(self.player_card, self.ai_card)
-            if result in ["win", "lose"]:
-                self.battle_result = result
-                self.show_result_popup = True
-                if result == "win":
-                    self.player.score += 1
-                    self.current_round_winner = "Player"
-                    pyxel.play(3, 3)
-                else:
-                    self.ai_player.score += 1
-                    self.current_round_winner = "CPU"
-                    pyxel.play(3, 4)
-            else:  # 引き分けの場合
-                self.round += 1
+        if self.engine.record is self.saved_record:
+            return  # Q で保存した後、終了時の save_session でもう一度呼ばれる
+        directory = os.path.join(pyxel.user_data_dir("yt-hsgw", "ecard"), "replays")
+        os.makedirs(directory, exist_ok=True)
+        # 早送りなどで同じ秒に終わった試合を上書きしないよう、ミリ秒まで入れる
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        path = os.path.join(directory, stamp + ".ecr")
+        count = 1
+        while os.path.exists(path):
+            # 同じミリ秒でも上書きしない（"_" は "." より後に並ぶので、削除の順も保たれる）
+            path = os.path.join(directory, f"{stamp}_{count}.ecr")
+            count += 1
+        self.engine.record.save(path)
+        self.saved_record = self.engine.record
+        records = sorted(name for name in os.listdir(directory) if name.endswith(".ecr"))
+        for name in records[:-MAX_SAVED_RECORDS]:
+            os.remove(os.path.join(directory, name))
+
+    def load_opponent_model(self) -> "opponent_model_module.OpponentModel":
+        """プレイヤーの癖の学習結果を読み込む（2回目以降は読み込み済みのものを返す）"""
+        if self.opponent_model is None:
+            path = os.path.join(pyxel.user_data_dir("yt-hsgw", "ecard"), "opponent_model.bin")
+            self.opponent_model = opponent_model_module.OpponentModel.load(path)
+        return self.opponent_model
+
+    def hand_card_x(self, index: int, count: int) -> int:
+        """手札（プレイヤー・CPU 共通の並び）の index 枚目の x 座標"""
+        total_width = (self.CARD_WIDTH + self.CARD_SPACING) * count
+        return (self.width - total_width) // 2 + index * (self.CARD_WIDTH + self.CARD_SPACING)
+        
+    def animate_deal(self):
+        """配った手札が画面の外から並ぶアニメーションを開始する"""
+        player_y = self.height - self.CARD_HEIGHT - 20
+        for i in range(len(self.player.hand)):
+            x = self.hand_card_x(i, len(self.player.hand))
+            self.tweens.start(TWEEN_DEAL, i, x, self.height, x, player_y,
+                              DEAL_TICKS, delay=i * DEAL_STAGGER_TICKS)
+        for i in range(len(self.ai_player.hand)):
+            x = self.hand_card_x(i, len(self.ai_player.hand))
+            self.tweens.start(TWEEN_DEAL, CPU_DEAL_KEY + i, x, -self.CARD_HEIGHT, x, 30,
+                              DEAL_TICKS, delay=i * DEAL_STAGGER_TICKS)
+        
+    def animate_play(self, card_index: int, player_count: int, ai_card_index: int, ai_count: int,
+                     decided: bool):
+        """出したカードが手札から場へ移動し、CPU のカードを裏返すアニメーションを開始する"""
+        played_x = self.width // 2 - PLAYED_CARD_WIDTH // 2
+        self.tweens.start(TWEEN_PLAY, 0, self.hand_card_x(card_index, player_count),
+                          self.height - self.CARD_HEIGHT - 25, played_x, self.height // 2 + 20, SLIDE_TICKS)
+        self.tweens.start(TWEEN_PLAY, 1, self.hand_card_x(ai_card_index, ai_count), 30,
+                          played_x, self.height // 2 - 50, SLIDE_TICKS)
+        self.tweens.start(TWEEN_FLIP, 1, 0, 0, 0, 0, FLIP_TICKS, delay=SLIDE_TICKS, ease=LINEAR)
+        if decided:
+            self.tweens.start(TWEEN_POPUP, 0, 0, 0, 0, 0, POPUP_FADE_TICKS,
+                              delay=SLIDE_TICKS + FLIP_TICKS, ease=LINEAR)
+        
+    def play_card(self, card_index: int, ai_card_index: int = None):
+        player_count = len(self.player.hand)
+        ai_count = len(self.ai_player.hand)
+        # カードのプレイと勝敗判定は MatchEngine が行う
+        result = self.engine.play_card(card_index, ai_card_index)
+        # 出した分だけ手札が減るので、選択位置を残りの手札の範囲に収める
+        self.selected_card_index = min(self.selected_card_index, max(0, len(self.player.hand) - 1))
+        if result is None:
+            # 出せなかった（位置が手札の外など）: CPU の手は使ってしまったので思考をやり直す
+            self.start_ai_turn()
+            return
+        # CPU の手はエンジンが決めた場合もあるので記録から取る
+        self.animate_play(card_index, player_count, self.engine.record.moves[-1][1], ai_count,
+                          result in ["win", "lose"])
+        if result == "draw":
+            # 引き分けなら次のターンの思考を開始
+            self.start_ai_turn()
+        elif result in ["win", "lose"]:
+            self.show_result_popup = True
+            if result == "win":
+                self.current_round_winner = "Player"
+                self.sounds.play(3, 3)
+            else:
+                self.current_round_winner = "CPU"
+                self.sounds.play(3, 4)
 
     def judge_cards(self, card1: Card, card2: Card) -> str:
         """カードの勝敗判定"""
-        if card1.card_type == card2.card_type:
-            return "draw"
-        
-        if card1.card_type == CardType.EMPEROR:
-            return "win" if card2.card_type == CardType.CITIZEN else "lose"
-        elif card1.card_type == CardType.CITIZEN:
-            return "win" if card2.card_type == CardType.SLAVE else "lose"
-        else:  # SLAVE
-            return "win" if card2.card_type == CardType.EMPEROR else "lose"
+        return self.engine.judge_cards(card1, card2)
 
     def is_emperor_vs_slave(self) -> bool:
         """皇帝vs奴隷の判定"""
-        return ((self.player_card.card_type == CardType.EMPEROR and 
-                self.ai_card.card_type == CardType.SLAVE) or
-               (self.player_card.card_type == CardType.SLAVE and 
-                self.ai_card.card_type == CardType.EMPEROR))
+        return self.engine.is_emperor_vs_slave()
 
     def next_battle(self):
         """次の戦へ移行"""
-        # 場のカードをリセット
-        self.player_card = None
-        self.ai_card = None
-        
-        self.current_battle += 1
-        if self.current_battle > self.total_battles:
+        if not self.engine.next_battle():
             self.game_state = GameState.RESULT
+            # 1試合ごとに学習結果と試合の記録を保存
+            if self.opponent_model is not None:
+                self.opponent_model.save()
+            self.save_match_record()
         else:
-            # 陣営を交代
-            self.player_is_emperor = not self.player_is_emperor
-            # 新しい手札を配布
-            self.player.hand = self.init_cards(self.player_is_emperor)
-            self.ai_player.hand = self.init_cards(not self.player_is_emperor)
-            self.round = 1
+            self.start_ai_turn()  # 新しいバトルの思考を開始
+            self.animate_deal()
 
     def update_game(self):
+        if self.tweens.busy:
+            return  # アニメーションが終わるまで入力を受け付けない
         if self.show_result_popup:
-            if pyxel.btnp(pyxel.KEY_SPACE):  # Spaceキーで次のバトルへ
+            if self.btnp(pyxel.KEY_SPACE) or self.demo_elapsed(DEMO_PAUSE_TICKS):  # Spaceキーで次のバトルへ
                 self.show_result_popup = False
                 self.next_battle()
         else:
             if not self.player or not self.ai_player:
                 return
                 
-            if self.player.player_type == PlayerType.HUMAN:
+            if self.pending_card_index is not None:
+                # CPU の手が決まるまで待つ（描画は止めずに毎フレーム確認する）
+                if self.fast_forward:
+                    ai_card_index = self.ai_pipeline.wait()
+                else:
+                    ai_card_index = self.ai_pipeline.poll()
+                if ai_card_index is not None:
+                    card_index = self.pending_card_index
+                    self.pending_card_index = None  # 出せなかった場合も選択に戻る
+                    self.play_card(card_index, ai_card_index)
+            elif self.player.player_type == PlayerType.HUMAN:
                 # カード選択の処理
-                if pyxel.btnp(pyxel.KEY_LEFT):
+                if self.btnp(pyxel.KEY_LEFT):
                     self.selected_card_index = (self.selected_card_index - 1) % max(1, len(self.player.hand))
-                elif pyxel.btnp(pyxel.KEY_RIGHT):
+                elif self.btnp(pyxel.KEY_RIGHT):
                     self.selected_card_index = (self.selected_card_index + 1) % max(1, len(self.player.hand))
-                elif pyxel.btnp(pyxel.KEY_SPACE):
-                    if len(self.player.hand) > 0:
-                        self.play_card(self.selected_card_index)
+                elif self.btnp(pyxel.KEY_SPACE):
+                    if 0 <= self.selected_card_index < len(self.player.hand):
+                        self.pending_card_index = self.selected_card_index
+                        self.ai_pipeline.commit()
+            elif self.demo_elapsed(DEMO_TURN_TICKS):
+                # デモではプレイヤー側も CPU が選ぶ（少し間を置いて出す）
+                self.selected_card_index = self.player.choose_card_index()
+                self.pending_card_index = self.selected_card_index
+                self.ai_pipeline.commit()
                     
     def draw_game(self):
         # 背景
-        pyxel.rect(0, 0, self.width, self.height, 1)
+        self.gfx.rect(0, 0, self.width, self.height, 1)
         
         # CPUの情報を左上に表示
         self.draw_player_info(self.ai_player, 10, 5)  # 左上
@@ -278,11 +629,11 @@ class Game:
         self.draw_player_info(self.player, self.width - 50, player_info_y)
         
         # バトル数とラウンド数の表示
-        battle_text = f"Battle {self.current_battle}/6"
-        round_text = f"Turn {self.round}"  # "Round" を "Turn" に変更
+        battle_text = self.layout.format("battle", "Battle {}/{}", self.current_battle, self.total_battles)
+        round_text = self.layout.format("turn", "Turn {}", self.round)  # "Round" を "Turn" に変更
         
-        pyxel.text(self.width // 2 - 30, 5, battle_text, 7)
-        pyxel.text(self.width // 2 - 20, 15, round_text, 7)
+        self.gfx.text(self.width // 2 - 30, 5, battle_text, 7)
+        self.gfx.text(self.width // 2 - 20, 15, round_text, 7)
         
         # CPU側の手札（裏面）表示
         self.draw_cpu_hand()
@@ -296,9 +647,17 @@ class Game:
         # 操作ガイド表示
         self.draw_controls()
 
-        # 決着時のポップアップを表示
+        # 決着時のポップアップを表示（カードの裏返しが終わってからフェードインする）
         if self.show_result_popup:
-            self.draw_result_popup()
+            slot = self.tweens.find(TWEEN_POPUP, 0)
+            if slot < 0:
+                self.draw_result_popup()
+            elif self.tweens.started(slot):
+                fade = FADE_LEVELS[round((1.0 - self.tweens.progress(slot)) * (len(FADE_LEVELS) - 1))]
+                for col in range(16):
+                    self.gfx.pal(col, fade[col])
+                self.draw_result_popup()
+                self.gfx.pal()
 
     def draw_cpu_hand(self):
         if not self.ai_player or not self.ai_player.hand:
@@ -306,98 +665,81 @@ class Game:
             
         card_width = 28
         card_height = 38
-        spacing = 4
-        
-        total_width = (card_width + spacing) * len(self.ai_player.hand)
-        start_x = (self.width - total_width) // 2
         
         for i in range(len(self.ai_player.hand)):
-            x = start_x + i * (card_width + spacing)
+            x = self.hand_card_x(i, len(self.ai_player.hand))
             y = 30  # 上部に配置
+            # 配っている途中のカードはアニメーションの位置に描く
+            slot = self.tweens.find(TWEEN_DEAL, CPU_DEAL_KEY + i)
+            if slot >= 0:
+                y = int(self.tweens.y(slot))
             
             # 裏面のカードを描画
             self.draw_card_back(x, y, card_width, card_height)
 
     def draw_card_back(self, x: int, y: int, width: int, height: int):
-        # カードの裏面デザイン
-        pyxel.rect(x, y, width, height, 13)  # 背景色
-        pyxel.rectb(x, y, width, height, 7)  # 枠線
-        
-        # 裏面のパターン（シンプルな格子模様）
-        for i in range(2, width - 2, 4):
-            for j in range(2, height - 2, 4):
-                pyxel.rect(x + i, y + j, 2, 2, 6)
+        # カードの裏面デザイン（アトラスに無い大きさはその場で描く）
+        if not self.card_atlas.draw(self.gfx, CARD_BACK, x, y, width, height):
+            draw_card_back_face(self.gfx, x, y, width, height)
 
     def draw_player_info(self, player: Player, x: int, y: int):
         name_color = 10 if player == self.player else 7
-        pyxel.text(x, y, f"{player.name}", name_color)
-        pyxel.text(x, y + 8, f"Score: {player.score}", 7)
-        pyxel.text(x, y + 16, f"Cards: {player.get_hand_size()}", 7)
+        # 文字列はスコア・枚数が変わったときだけ作り直す
+        self.gfx.text(x, y, player.name, name_color)
+        self.gfx.text(x, y + 8, self.layout.format(("score", x, y), "Score: {}", player.score), 7)
+        self.gfx.text(x, y + 16, self.layout.format(("cards", x, y), "Cards: {}", player.get_hand_size()), 7)
         
     def draw_played_cards(self):
         if not self.player_card and not self.ai_card:
             return
             
         # カードサイズを定数として定義
-        card_width = 25
-        card_height = 35
+        card_width = PLAYED_CARD_WIDTH
+        card_height = PLAYED_CARD_HEIGHT
         
-        # プレイヤーのカード表示位置
+        # プレイヤーのカード表示位置（手札から移動中ならその位置）
         if self.player_card:
             x = self.width // 2 - card_width // 2
             y = self.height // 2 + 20
+            slot = self.tweens.find(TWEEN_PLAY, 0)
+            if slot >= 0:
+                x, y = int(self.tweens.x(slot)), int(self.tweens.y(slot))
             self.draw_card(self.player_card, x, y, card_width, card_height)
             
-        # AIのカード表示位置
+        # AIのカード表示位置（移動中は裏向きで、到着してから裏返す）
         if self.ai_card:
             x = self.width // 2 - card_width // 2
             y = self.height // 2 - 50
-            self.draw_card(self.ai_card, x, y, card_width, card_height)
+            slot = self.tweens.find(TWEEN_PLAY, 1)
+            if slot >= 0:
+                x, y = int(self.tweens.x(slot)), int(self.tweens.y(slot))
+            flip = self.tweens.find(TWEEN_FLIP, 1)
+            if flip < 0:
+                self.draw_card(self.ai_card, x, y, card_width, card_height)
+                return
+            # 幅を縮めて裏面を閉じ、表面を開く
+            t = self.tweens.progress(flip)
+            flip_width = int(card_width * abs(1.0 - 2.0 * t))
+            if flip_width > 0:
+                flip_x = x + (card_width - flip_width) // 2
+                if t < 0.5:
+                    self.draw_card_back(flip_x, y, flip_width, card_height)
+                else:
+                    self.draw_card(self.ai_card, flip_x, y, flip_width, card_height)
 
     def draw_card(self, card: Card, x: int, y: int, width: int, height: int):
-        # カードの色を種類によって変更
-        bg_color = 5  # デフォルト（市民）は灰色
-        if card.card_type == CardType.EMPEROR:
-            bg_color = 9  # 皇帝は青
-        elif card.card_type == CardType.SLAVE:
-            bg_color = 8  # 奴隷は赤
-
-        # カードの背景
-        pyxel.rect(x, y, width, height, bg_color)
-        # カードの枠
-        pyxel.rectb(x, y, width, height, 7)
-        
-        # カードの種類のテキスト（短縮版の英語表記）
-        card_type = "EMP" if card.card_type == CardType.EMPEROR else "CIT" if card.card_type == CardType.CITIZEN else "SLV"
-        
-        # テキストの中央配置の計算
-        text_width = len(card_type) * 4  # 英語フォントは1文字4ピクセル
-        text_x = x + (width - text_width) // 2
-        text_y = y + (height - 5) // 2  # フォントの高さを考慮して調整
-        
-        # テキストを描画
-        pyxel.text(text_x, text_y, card_type, 0)
-        
-        # カードの種類を示すアイコンや記号を追加（オプション）
-        icon_y = y + 5  # 上部に配置
-        if card.card_type == CardType.EMPEROR:
-            pyxel.text(x + 5, icon_y, "E", 0)  # 左上
-            pyxel.text(x + width - 9, y + height - 10, "E", 0)  # 右下
-        elif card.card_type == CardType.CITIZEN:
-            pyxel.text(x + 5, icon_y, "C", 0)  # 左上
-            pyxel.text(x + width - 9, y + height - 10, "C", 0)  # 右下
-        else:  # SLAVE
-            pyxel.text(x + 5, icon_y, "S", 0)  # 左上
-            pyxel.text(x + width - 9, y + height - 10, "S", 0)  # 右下
+        # 使う大きさのカードはアトラスから blt 1回で描く（無い大きさはその場で描く）
+        if not self.card_atlas.draw(self.gfx, card.card_type, x, y, width, height):
+            draw_card_face(self.gfx, card.card_type, x, y, width, height)
 
     def draw_controls(self):
         # コントロール説明のテキスト（英語表記）
         arrow_text = "ARROWS: SELECT"
         space_text = "SPACE: DECIDE"
         
-        # 各テキストの幅を計算（英語は1文字4ピクセル）
-        arrow_width = len(arrow_text) * 4
-        space_width = len(space_text) * 4
+        # 各テキストの幅（フォントで測った値をキャッシュしたもの）
+        arrow_width = self.layout.text_width(arrow_text)
+        space_width = self.layout.text_width(space_text)
         total_width = arrow_width + 20 + space_width  # 20は間隔
         
         # 開始位置を計算（画面中央から左右に配置）
@@ -405,21 +747,22 @@ class Game:
         text_y = self.height - 10
         
         # 左側のコントロール説明
-        pyxel.text(start_x, text_y, arrow_text, 7)
+        self.gfx.text(start_x, text_y, arrow_text, 7)
         # 右側のコントロール説明
-        pyxel.text(start_x + arrow_width + 20, text_y, space_text, 7)
+        self.gfx.text(start_x + arrow_width + 20, text_y, space_text, 7)
 
     def update_result(self):
-        if pyxel.btnp(pyxel.KEY_SPACE):  # Enterキーの代わりにSpaceキーに変更
+        if self.demo and self.demo_elapsed(DEMO_PAUSE_TICKS):
+            self.start_game(GameMode.PVE)  # デモは次の試合を続ける
+        elif self.btnp(pyxel.KEY_SPACE):  # Enterキーの代わりにSpaceキーに変更
+            self.demo = False
+            self.replay_record = None
             self.game_state = GameState.TITLE
             pyxel.stop()  # すべての音を停止
             
     def draw_result(self):
         # 半透明の黒い背景（ディザリングパターン）
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x + y) % 2 == 0:
-                    pyxel.pset(x, y, 0)
+        self.dither_overlay.draw(target=self.gfx)
 
         # ポップアップウィンドウ
         window_width = 160
@@ -428,51 +771,51 @@ class Game:
         y = (self.height - window_height) // 2
         
         # ウィンドウの背景と枠
-        pyxel.rect(x, y, window_width, window_height, 5)  # 背景
-        pyxel.rectb(x, y, window_width, window_height, 7)  # 枠線
+        self.gfx.rect(x, y, window_width, window_height, 5)  # 背景
+        self.gfx.rectb(x, y, window_width, window_height, 7)  # 枠線
         
         # 最終結果の判定
         final_result = "WIN" if self.player.score > self.ai_player.score else "LOSE" if self.player.score < self.ai_player.score else "DRAW"
         title_bg_color = 11 if final_result == "WIN" else 8 if final_result == "LOSE" else 6  # DRAW は緑色
         
         # タイトル部分の背景
-        pyxel.rect(x + 2, y + 2, window_width - 4, 16, title_bg_color)
+        self.gfx.rect(x + 2, y + 2, window_width - 4, 16, title_bg_color)
         
         # GAME OVER テキスト
         game_over_text = "GAME OVER"
-        text_x = x + (window_width - len(game_over_text) * 4) // 2
-        pyxel.text(text_x, y + 6, game_over_text, 7)
+        text_x = self.layout.center_x(game_over_text, x, window_width)
+        self.gfx.text(text_x, y + 6, game_over_text, 7)
         
         # 勝敗テキスト
-        result_text = f"YOU {final_result}!"
-        text_x = x + (window_width - len(result_text) * 4) // 2
-        pyxel.text(text_x, y + 25, result_text, title_bg_color)
+        result_text = self.layout.format("final_result", "YOU {}!", final_result)
+        text_x = self.layout.center_x(result_text, x, window_width)
+        self.gfx.text(text_x, y + 25, result_text, title_bg_color)
         
         # スコア表示
-        pyxel.text(x + 20, y + 45, "【 Final Score 】", 7)
+        self.gfx.text(x + 20, y + 45, "【 Final Score 】", 7)
         
         # プレイヤーのスコア
         player_score_color = 11 if self.player.score > self.ai_player.score else 7
-        pyxel.text(x + 20, y + 60, "YOU:", 7)
-        pyxel.text(x + 50, y + 60, f"{self.player.score}", player_score_color)
+        self.gfx.text(x + 20, y + 60, "YOU:", 7)
+        self.gfx.text(x + 50, y + 60, self.layout.format("final_player", "{}", self.player.score), player_score_color)
         
         # CPUのスコア
         cpu_score_color = 11 if self.ai_player.score > self.player.score else 7
-        pyxel.text(x + 20, y + 70, "CPU:", 7)
-        pyxel.text(x + 50, y + 70, f"{self.ai_player.score}", cpu_score_color)
+        self.gfx.text(x + 20, y + 70, "CPU:", 7)
+        self.gfx.text(x + 50, y + 70, self.layout.format("final_cpu", "{}", self.ai_player.score), cpu_score_color)
         
         # 続行方法の案内
-        pyxel.text(x + 20, y + 85, "Press SPACE to title screen", 7)
+        self.gfx.text(x + 20, y + 85, "Press SPACE to title screen", 7)
 
     def update_mode_select(self):
         # 上下キーでモード選択
-        if pyxel.btnp(pyxel.KEY_UP):
+        if self.btnp(pyxel.KEY_UP):
             self.selected_mode = (self.selected_mode - 1) % 2
-        elif pyxel.btnp(pyxel.KEY_DOWN):
+        elif self.btnp(pyxel.KEY_DOWN):
             self.selected_mode = (self.selected_mode + 1) % 2
             
         # Spaceキーで決定
-        if pyxel.btnp(pyxel.KEY_SPACE):
+        if self.btnp(pyxel.KEY_SPACE):
             if self.selected_mode == 0:
                 # PVPモードは現在無効
                 pass
@@ -480,50 +823,50 @@ class Game:
                 self.start_game(GameMode.PVE)
             
     def draw_mode_select(self):
-        pyxel.text(self.width // 2 - 40, self.height // 2 - 20, "Select Game Mode:", 7)
+        self.gfx.text(self.width // 2 - 40, self.height // 2 - 20, "Select Game Mode:", 7)
         
         # PvPモードのテキストと取り消し線
         text_y = self.height // 2
         text_x = self.width // 2 - 40
         text = "Player vs Player"
-        text_width = len(text) * 4  # 英語フォントは1文字4ピクセル
+        text_width = self.layout.text_width(text)
         
         # 選択中のモードは明るい色で表示
         text_color = 7 if self.selected_mode == 0 else 5
-        pyxel.text(text_x, text_y, text, text_color)
-        pyxel.line(text_x, text_y + 3, text_x + text_width, text_y + 3, 5)  # 取り消し線
+        self.gfx.text(text_x, text_y, text, text_color)
+        self.gfx.line(text_x, text_y + 3, text_x + text_width, text_y + 3, 5)  # 取り消し線
         
         # PvEモードのテキスト
         text_y = self.height // 2 + 20
         text = "Player vs CPU"
         text_color = 7 if self.selected_mode == 1 else 5
-        pyxel.text(text_x, text_y, text, text_color)
+        self.gfx.text(text_x, text_y, text, text_color)
         
         # 選択中のモードを示すカーソル
         cursor_x = text_x - 10
         cursor_y = self.height // 2 + (20 * self.selected_mode)
-        pyxel.text(cursor_x, cursor_y, ">", 7)
+        self.gfx.text(cursor_x, cursor_y, ">", 7)
 
     def draw_hand(self, player: Player, selected_index: int):
         if not player or not player.hand:
             return
             
-        # 手札の合計幅を計算
-        total_width = (self.CARD_WIDTH + self.CARD_SPACING) * len(player.hand)
-        start_x = (self.width - total_width) // 2
-
         for i, card in enumerate(player.hand):
-            x = start_x + i * (self.CARD_WIDTH + self.CARD_SPACING)
+            x = self.hand_card_x(i, len(player.hand))
             y = self.height - self.CARD_HEIGHT - 20
             
             # 選択中のカードは少し上に表示
             if i == selected_index:
                 y -= 5
+            # 配っている途中のカードはアニメーションの位置に描く
+            slot = self.tweens.find(TWEEN_DEAL, i)
+            if slot >= 0:
+                y = int(self.tweens.y(slot))
                 
             self.draw_card(card, x, y, self.CARD_WIDTH, self.CARD_HEIGHT)
 
     def draw_text(self, x: int, y: int, text: str, col: int):
-        pyxel.text(x, y, text, col)
+        self.gfx.text(x, y, text, col)
 
     def draw_cards_history(self):
         if not self.played_cards_history:
@@ -546,10 +889,7 @@ class Game:
 
     def draw_result_popup(self):
         # 半透明の黒い背景（ディザリングパターン）
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x + y) % 2 == 0:
-                    pyxel.pset(x, y, 0)
+        self.dither_overlay.draw(target=self.gfx)
 
         # ポップアップウィンドウ
         window_width = 160
@@ -558,38 +898,38 @@ class Game:
         y = (self.height - window_height) // 2
         
         # ウィンドウの背景と枠
-        pyxel.rect(x, y, window_width, window_height, 5)  # 背景
-        pyxel.rectb(x, y, window_width, window_height, 7) # 枠線
+        self.gfx.rect(x, y, window_width, window_height, 5)  # 背景
+        self.gfx.rectb(x, y, window_width, window_height, 7) # 枠線
         
         # タイトル部分の背景
         title_bg_color = 11 if self.battle_result == "win" else 8
-        pyxel.rect(x + 2, y + 2, window_width - 4, 16, title_bg_color)
+        self.gfx.rect(x + 2, y + 2, window_width - 4, 16, title_bg_color)
         
         # 決着テキスト
         result_text = "BATTLE FINISHED!"
-        text_x = x + (window_width - len(result_text) * 4) // 2
-        pyxel.text(text_x, y + 6, result_text, 7)
+        text_x = self.layout.center_x(result_text, x, window_width)
+        self.gfx.text(text_x, y + 6, result_text, 7)
         
         # 勝敗テキスト
         result_text = "YOU WIN!" if self.battle_result == "win" else "YOU LOSE..."
-        text_x = x + (window_width - len(result_text) * 4) // 2
-        pyxel.text(text_x, y + 25, result_text, title_bg_color)
+        text_x = self.layout.center_x(result_text, x, window_width)
+        self.gfx.text(text_x, y + 25, result_text, title_bg_color)
         
         # カード対決の結果表示
-        pyxel.text(x + 20, y + 45, "【 Card Battle Result 】", 7)
+        self.gfx.text(x + 20, y + 45, "【 Card Battle Result 】", 7)
         
         # プレイヤーのカード情報
         player_card_color = self.get_card_color(self.player_card.card_type)
-        pyxel.text(x + 20, y + 60, "YOU:", 7)
-        pyxel.text(x + 50, y + 60, f"{self.player_card.card_type.name}", player_card_color)
+        self.gfx.text(x + 20, y + 60, "YOU:", 7)
+        self.gfx.text(x + 50, y + 60, self.player_card.card_type.name, player_card_color)
         
         # CPUのカード情報
         cpu_card_color = self.get_card_color(self.ai_card.card_type)
-        pyxel.text(x + 20, y + 70, "CPU:", 7)
-        pyxel.text(x + 50, y + 70, f"{self.ai_card.card_type.name}", cpu_card_color)
+        self.gfx.text(x + 20, y + 70, "CPU:", 7)
+        self.gfx.text(x + 50, y + 70, self.ai_card.card_type.name, cpu_card_color)
         
         # 続行方法の案内
-        pyxel.text(x + 30, y + 85, "Press SPACE to Next Battle", 7)
+        self.gfx.text(x + 30, y + 85, "Press SPACE to Next Battle", 7)
 
     def get_card_color(self, card_type: CardType) -> int:
         """カードの種類に応じた色を返す"""
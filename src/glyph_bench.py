@@ -0,0 +1,152 @@
+"""pyxelunicode のグリフのラスタライズのベンチマーク
+
+JIS 第1水準漢字（EUC-JP の 0xB0A1〜0xCFD3、2965字）を1字ずつラスタライズする時間を計る。
+pyxel の画面は使わないので、ウィンドウを開かずに実行できる。
+--workers を指定すると PyxelUnicode.prewarm でバックグラウンドのスレッドに任せ、全部終わるまでの時間を計る。
+--cache を指定するとグリフのディスクキャッシュを使う（2回目以降の計測はキャッシュからの読み込みになる）。
+最後に、グリフの保持の仕方（ビットを詰めた GlyphStore と、1ピクセル1要素の入れ子のリスト）ごとの
+メモリ使用量と参照の時間を表示する。
+--output を指定すると結果を JSON Lines で追記するので、コミットごとに実行して比較できる。
+
+    python src/glyph_bench.py -n 5 --output glyphs.jsonl
+"""
+
+import argparse
+import concurrent.futures
+import json
+import statistics
+import time
+import tracemalloc
+
+from lazy import UNICODE_FONT_PATH, UNICODE_FONT_SIZE
+from startup_bench import git_revision
+
+def jis_level1_kanji() -> str:
+    """JIS 第1水準漢字（区点 16-01〜47-51）を EUC-JP の順に並べた文字列"""
+    chars = []
+    for high in range(0xB0, 0xD0):
+        for low in range(0xA1, 0xFF):
+            if (high, low) > (0xCF, 0xD3):
+                break
+            chars.append(bytes((high, low)).decode("euc_jp"))
+    return "".join(chars)
+
+def run_once(chars: str, size: int, multipler: int, mode: str, workers: int = 0,
+             cache_path: str = None) -> dict:
+    """新しいフォントで chars を全部ラスタライズして、時間（ミリ秒）を返す（workers が 0 なら同期で）"""
+    from library.pyxelunicode import PyxelUnicode
+    start = time.perf_counter()
+    font = PyxelUnicode(UNICODE_FONT_PATH, size, multipler, mode, cache_path=cache_path)
+    loaded = time.perf_counter()
+    if workers:
+        concurrent.futures.wait(font.prewarm(chars, workers))
+        font.shutdown()
+    elif cache_path:
+        for char in chars:
+            font._get_char(char)
+    else:
+        for char in chars:
+            font._extract_pixel(char)
+    end = time.perf_counter()
+    if font.cache is not None:
+        font.cache.close()
+    return {"load_ms": (loaded - start) * 1000, "total_ms": (end - loaded) * 1000,
+            "per_glyph_us": (end - loaded) * 1e6 / len(chars)}
+
+def allocated(build) -> tuple:
+    """build() の戻り値と、それが確保したままのメモリ（バイト）"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+def timed(function, repeat: int = 5) -> float:
+    """function() の時間の中央値（ミリ秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def storage_report(chars: str, size: int, multipler: int, mode: str) -> dict:
+    """chars のグリフを GlyphStore と入れ子のリストに入れたときのメモリと参照の時間"""
+    from library.pyxelunicode import PyxelUnicode
+    from library.pyxelunicode.GlyphStore import GlyphStore
+    font = PyxelUnicode(UNICODE_FONT_PATH, size, multipler, mode)
+    packed = {char: font.glyphs.pack(font._extract_pixel(char)) for char in chars}
+
+    def build_store():
+        store = GlyphStore(mode)
+        for char, (width, height, data) in packed.items():
+            store.add_packed(char, width, height, data)
+        return store
+    store, store_bytes = allocated(build_store)
+    lists, list_bytes = allocated(lambda: {char: store.pixels(char) for char in chars})
+
+    def lookup_lists():
+        for char in chars:
+            rows = lists[char]
+            rows[0], len(rows[0]), len(rows)
+
+    def lookup_store():
+        for char in chars:
+            store.bitmap(char), store.size(char)
+
+    def scan_lists():
+        for char in chars:
+            for row in lists[char]:
+                for pixel in row:
+                    pass
+
+    def scan_store():
+        for char in chars:
+            for _ in store.lit(char):
+                pass
+    return {"glyphs": len(chars), "store_data_bytes": store.nbytes,
+            "store_bytes": store_bytes, "list_bytes": list_bytes,
+            "lookup_store_ms": timed(lookup_store), "lookup_list_ms": timed(lookup_lists),
+            "scan_store_ms": timed(scan_store), "scan_list_ms": timed(scan_lists)}
+
+def main():
+    parser = argparse.ArgumentParser(description="JIS 第1水準漢字のラスタライズの時間を計る")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="計測する回数")
+    parser.add_argument("--size", type=int, default=UNICODE_FONT_SIZE, help="フォントの大きさ")
+    parser.add_argument("--multipler", type=int, default=8, help="サンプリングの倍率")
+    parser.add_argument("--mode", choices=("1", "L"), default="1", help="二値 (1) かグレースケール (L) か")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="prewarm のスレッド数（0 ならメインスレッドで1字ずつ）")
+    parser.add_argument("--cache", metavar="FILE", help="グリフのディスクキャッシュのファイル")
+    parser.add_argument("--output", help="結果を JSON Lines で追記するファイル")
+    args = parser.parse_args()
+
+    chars = jis_level1_kanji()
+    options = (args.size, args.multipler, args.mode, args.workers, args.cache)
+    run_once(chars[:50], *options)  # 1回目は import などが入るので捨てる
+    runs = [run_once(chars, *options) for _ in range(args.runs)]
+    summary = {"revision": git_revision(), "runs": args.runs, "glyphs": len(chars),
+               "size": args.size, "multipler": args.multipler, "mode": args.mode,
+               "workers": args.workers, "cache": bool(args.cache)}
+    for key in ("load_ms", "total_ms", "per_glyph_us"):
+        values = [run[key] for run in runs]
+        summary[key] = {"min": round(min(values), 2), "median": round(statistics.median(values), 2),
+                        "max": round(max(values), 2)}
+        print(f"{key:15} min {min(values):10.2f}  median {statistics.median(values):10.2f}"
+              f"  max {max(values):10.2f}")
+    storage = storage_report(chars, args.size, args.multipler, args.mode)
+    summary["storage"] = {key: round(value, 3) for key, value in storage.items()}
+    print(f"memory      GlyphStore {storage['store_bytes'] / 1024:9.1f} KiB"
+          f" ({storage['store_data_bytes'] / 1024:.1f} KiB of bitmaps)"
+          f"  lists {storage['list_bytes'] / 1024:9.1f} KiB")
+    print(f"lookup (ms) GlyphStore {storage['lookup_store_ms']:9.2f}"
+          f"      lists {storage['lookup_list_ms']:9.2f}")
+    print(f"scan (ms)   GlyphStore {storage['scan_store_ms']:9.2f}"
+          f"      lists {storage['scan_list_ms']:9.2f}")
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+
+if __name__ == "__main__":
+    main()
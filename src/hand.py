@@ -0,0 +1,143 @@
+"""手札を1つの整数に詰めたコンパクトな表現
+
+List[Card] の代わりに、枚数・種類ごとの枚数・並び順をビットフィールドとして保持する。
+値は不変でハッシュ可能なので、そのまま状態のキャッシュのキーに使える。
+
+ビット配置:
+    0-2   : 枚数
+    3-11  : 種類ごとの枚数（3ビットずつ, CardType.value 順）
+    12-   : 並び順（1枚2ビット, 先頭のカードから CardType.value）
+"""
+
+from typing import Iterable, Iterator, List, Tuple
+from card import Card, CardType
+
+MAX_CARDS = 7  # 枚数フィールドに入る最大枚数
+
+_LENGTH_MASK = 0b111
+_COUNT_SHIFT = 3
+_COUNT_BITS = 3
+_COUNT_MASK = 0b111
+_SLOT_SHIFT = _COUNT_SHIFT + _COUNT_BITS * len(CardType)
+_SLOT_BITS = 2
+_SLOT_MASK = 0b11
+
+_TYPES = {card_type.value: card_type for card_type in CardType}
+
+# 描画や履歴で使う共有の Card（Card は不変なので種類ごとに1つで足りる）
+CARDS = {card_type: Card(card_type) for card_type in CardType}
+
+# 手札にある種類のビットマスク -> 出せるカードの種類
+_LEGAL_MOVES = {
+    mask: tuple(card_type for card_type in CardType if mask & (1 << card_type.value))
+    for mask in range(1 << len(CardType))
+}
+
+class Hand:
+    """不変・ハッシュ可能な手札
+
+    添字アクセスと反復では List[Card] と同じく Card を返すため、
+    Game.draw_hand などの描画処理はそのまま位置を描画できる。
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def from_types(cls, card_types: Iterable[CardType]) -> "Hand":
+        bits = 0
+        length = 0
+        for card_type in card_types:
+            if length >= MAX_CARDS:
+                raise ValueError(f"a hand holds at most {MAX_CARDS} cards")
+            bits += 1 << (_COUNT_SHIFT + _COUNT_BITS * card_type._value_)
+            bits |= card_type._value_ << (_SLOT_SHIFT + _SLOT_BITS * length)
+            length += 1
+        return cls(bits | length)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Card]) -> "Hand":
+        return cls.from_types(card.card_type for card in cards)
+
+    def __len__(self) -> int:
+        return self.bits & _LENGTH_MASK
+
+    def count(self, card_type: CardType) -> int:
+        """指定した種類のカードの枚数"""
+        return (self.bits >> (_COUNT_SHIFT + _COUNT_BITS * card_type._value_)) & _COUNT_MASK
+
+    @property
+    def counts(self) -> Tuple[int, int, int]:
+        """(皇帝, 市民, 奴隷) の枚数"""
+        return (self.count(CardType.EMPEROR), self.count(CardType.CITIZEN),
+                self.count(CardType.SLAVE))
+
+    @property
+    def counts_key(self) -> int:
+        """並び順を無視した手札の内容（同じ構成の手札は同じ値になる）"""
+        return self.bits & ((1 << _SLOT_SHIFT) - 1)
+
+    def type_at(self, index: int) -> CardType:
+        if not 0 <= index < len(self):
+            raise IndexError("hand index out of range")
+        return _TYPES[(self.bits >> (_SLOT_SHIFT + _SLOT_BITS * index)) & _SLOT_MASK]
+
+    def index(self, card_type: CardType) -> int:
+        """指定した種類のカードの先頭の位置"""
+        for index in range(len(self)):
+            if self.type_at(index) == card_type:
+                return index
+        raise ValueError(f"{card_type.name} is not in hand")
+
+    def indices_of(self, *card_types: CardType) -> List[int]:
+        """指定した種類のカードの位置の一覧"""
+        return [index for index in range(len(self)) if self.type_at(index) in card_types]
+
+    def legal_moves(self) -> Tuple[CardType, ...]:
+        """出すことのできるカードの種類（重複なし）"""
+        mask = 0
+        for card_type in CardType:
+            if self.count(card_type):
+                mask |= 1 << card_type._value_
+        return _LEGAL_MOVES[mask]
+
+    def remove_at(self, index: int) -> "Hand":
+        """index 番目のカードを除いた手札"""
+        card_type = self.type_at(index)
+        slots = self.bits >> _SLOT_SHIFT
+        shift = _SLOT_BITS * index
+        # index より前のスロットはそのまま、後ろのスロットを1枚分詰める
+        slots = (slots & ((1 << shift) - 1)) | ((slots >> (shift + _SLOT_BITS)) << shift)
+        counts = (self.bits & ((1 << _SLOT_SHIFT) - 1)) - 1
+        counts -= 1 << (_COUNT_SHIFT + _COUNT_BITS * card_type._value_)
+        return Hand((slots << _SLOT_SHIFT) | counts)
+
+    def remove(self, card_type: CardType) -> "Hand":
+        """指定した種類のカードを1枚除いた手札"""
+        return self.remove_at(self.index(card_type))
+
+    def types(self) -> Iterator[CardType]:
+        for index in range(len(self)):
+            yield self.type_at(index)
+
+    def to_cards(self) -> List[Card]:
+        """List[Card] への変換"""
+        return [CARDS[card_type] for card_type in self.types()]
+
+    def __getitem__(self, index: int) -> Card:
+        return CARDS[self.type_at(index)]
+
+    def __iter__(self) -> Iterator[Card]:
+        for card_type in self.types():
+            yield CARDS[card_type]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Hand) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"Hand([{', '.join(card_type.name for card_type in self.types())}])"
@@ -0,0 +1,56 @@
+"""文字列の幅の計測と配置のキャッシュ
+
+固定の文字列の幅・中央揃えの位置は画面サイズごとに一度だけ計算し、
+スコアなどの動的な文字列は元の値が変わったときだけ作り直す。
+幅は使っているフォントで実際に測る（pyxel 標準フォントは1文字4ピクセル、
+pyxelunicode の PyxelUnicode などのマルチバイト対応フォントは text_width の値）。
+"""
+
+from typing import Dict, Hashable, Optional, Tuple
+
+BUILTIN_CHAR_WIDTH = 4  # pyxel 標準フォントの1文字の幅（字間込み）
+
+class TextLayout:
+    """画面サイズとフォントごとの文字列の幅・位置のキャッシュ"""
+
+    def __init__(self, width: int, height: int, font=None):
+        self.font = font  # None なら pyxel 標準フォント、それ以外は text_width を持つフォント
+        self._widths: Dict[str, int] = {}
+        self._slots: Dict[Hashable, Tuple[tuple, str]] = {}
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int):
+        """画面サイズが変わったら配置を計算し直す"""
+        self.width = width
+        self.height = height
+        self._positions: Dict[Tuple[str, int, Optional[int]], int] = {}
+
+    def text_width(self, text: str) -> int:
+        """text を描いたときの幅（ピクセル）"""
+        width = self._widths.get(text)
+        if width is None:
+            if self.font is None:
+                width = len(text) * BUILTIN_CHAR_WIDTH
+            else:
+                width = self.font.text_width(text)
+            self._widths[text] = width
+        return width
+
+    def center_x(self, text: str, x: int = 0, width: Optional[int] = None) -> int:
+        """幅 width（省略時は画面幅）の範囲で text を中央揃えにするときの左端の x"""
+        key = (text, x, width)
+        position = self._positions.get(key)
+        if position is None:
+            area = self.width if width is None else width
+            position = x + (area - self.text_width(text)) // 2
+            self._positions[key] = position
+        return position
+
+    def format(self, slot: Hashable, template: str, *args) -> str:
+        """slot ごとに template.format(*args) を保持し、args が変わったときだけ作り直す"""
+        cached = self._slots.get(slot)
+        if cached is not None and cached[0] == args:
+            return cached[1]
+        text = template.format(*args)
+        self._slots[slot] = (args, text)
+        return text
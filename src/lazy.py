@@ -0,0 +1,53 @@
+"""使うときまで読み込まないモジュール
+
+タイトル画面では使わないサブシステム（CPU の思考・学習、同梱の PIL と pyxelunicode のフォント）は
+lazy_import で登録しておき、最初に属性を参照したときにモジュールを実行する。
+"""
+
+import importlib
+import os
+from functools import lru_cache
+
+LIBRARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "library")
+UNICODE_FONT_PATH = os.path.join(LIBRARY_DIR, "pixel_unicode", "Pixel-UniCode.ttf")
+UNICODE_FONT_SIZE = 16
+UNICODE_ATLAS_BANK = 1  # グリフのアトラスに使うイメージバンク（0 はカードのスプライト）
+
+class LazyModule:
+    """最初に属性を参照したときに import するモジュールの代理
+
+    importlib.util.LazyLoader と違い sys.modules には入れないので、
+    pyxel.init などが sys.modules を走査しても読み込みは起きない。
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """name のモジュールの代理を返す（import は最初に属性を参照したときに行う）"""
+    return LazyModule(name)
+
+@lru_cache(maxsize=None)
+def unicode_font(font_path: str = UNICODE_FONT_PATH, size: int = UNICODE_FONT_SIZE):
+    """同梱の pyxelunicode によるマルチバイト文字のフォント（最初に使うときに PIL ごと読み込む）
+
+    ラスタライズしたグリフはユーザーデータフォルダのキャッシュに保存し、次回からはそこから読む。
+    同梱の PIL の拡張モジュール（*.so / *.pyd）が無い環境では None を返す。
+    """
+    import pyxel
+    try:
+        from library.pyxelunicode import PyxelUnicode
+    except ImportError:
+        return None
+    cache_path = os.path.join(pyxel.user_data_dir("yt-hsgw", "ecard"), f"glyphs_{size}.cache")
+    return PyxelUnicode(font_path, size, atlas_bank=UNICODE_ATLAS_BANK, cache_path=cache_path)
@@ -0,0 +1,152 @@
+from collections import OrderedDict
+import pyxel
+
+
+class GlyphAtlas(object):
+    '''a glyph cache stored in a pyxel image bank
+
+    Each glyph is rasterized once into a cell of the bank (lit pixels in INK,
+    the rest in the transparent color KEY), so drawing it is a single blt.
+    The caller remaps INK to the text color with pyxel.pal().
+    Cells are packed into free rectangles and the least recently used glyphs
+    are evicted when the bank (or max_glyphs) is full.
+    '''
+
+    INK = 1
+    KEY = 0
+
+    def __init__(self, bank: int = 1, rect: tuple = None, max_glyphs: int = None):
+        """initialize the atlas
+        Args:
+            bank: (default=1)
+                index of the pyxel image bank used for the atlas
+            rect: (default=None)
+                (u, v, w, h) region of the bank to use, None means the whole bank
+            max_glyphs: (default=None)
+                maximum number of cached glyphs, None means limited by space only
+        """
+        self.bank = bank
+        self.image = pyxel.images[bank]
+        if rect is None:
+            rect = (0, 0, self.image.width, self.image.height)
+        self.rect = rect
+        self.max_glyphs = max_glyphs
+        self.__cells = OrderedDict()  # key -> (u, v, w, h), oldest first
+        self.__free = [rect]
+
+    def __len__(self):
+        return len(self.__cells)
+
+    def __contains__(self, key):
+        return key in self.__cells
+
+    def clear(self):
+        """forget every glyph and free the whole region"""
+        self.__cells.clear()
+        self.__free = [self.rect]
+
+    def cell(self, key, glyphs):
+        """return the (u, v, w, h) cell of the glyph, rasterizing it on a miss
+        Args:
+            key:
+                cache key of the glyph (usually the character)
+            glyphs:
+                GlyphStore holding the glyph
+        Returns:
+            (u, v, w, h), or None if the glyph can not fit in the region
+        """
+        cell = self.__cells.get(key)
+        if cell is not None:
+            self.__cells.move_to_end(key)
+            return cell
+        width, height = glyphs.size(key)
+        if width == 0 or height == 0:
+            return None
+        if self.max_glyphs is not None and len(self.__cells) >= self.max_glyphs:
+            self._evict()
+        u_v = self._allocate(width, height)
+        while u_v is None and self.__cells:
+            self._evict()
+            u_v = self._allocate(width, height)
+        if u_v is None:
+            # free rectangles were fragmented by evictions: start over
+            self.__free = [self.rect]
+            u_v = self._allocate(width, height)
+            if u_v is None:
+                return None
+        u, v = u_v
+        rows = [['%x' % self.KEY]*width for _ in range(height)]
+        ink = '%x' % self.INK
+        for x, y, _ in glyphs.lit(key):
+            rows[y][x] = ink
+        self.image.set(u, v, [''.join(row) for row in rows])
+        cell = (u, v, width, height)
+        self.__cells[key] = cell
+        return cell
+
+    def draw(self, x: int, y: int, key, glyphs, target=pyxel) -> bool:
+        """blt the glyph at (x, y) of target in INK (remap it with target.pal beforehand)
+        Returns:
+            False if the glyph is not in the atlas and can not be added
+        """
+        cell = self.cell(key, glyphs)
+        if cell is None:
+            return False
+        target.blt(x, y, self.bank, cell[0], cell[1], cell[2], cell[3], self.KEY)
+        return True
+
+    def _evict(self):
+        """free the cell of the least recently used glyph"""
+        _, cell = self.__cells.popitem(last=False)
+        self.__free.append(cell)
+        self._merge_free()
+
+    def _allocate(self, width: int, height: int):
+        """take a width x height area from the free rectangles (best short side fit)
+        Returns:
+            (u, v) or None
+        """
+        best = None
+        best_score = None
+        for i, (u, v, w, h) in enumerate(self.__free):
+            if w >= width and h >= height:
+                score = min(w - width, h - height)
+                if best_score is None or score < best_score:
+                    best = i
+                    best_score = score
+        if best is None:
+            return None
+        u, v, w, h = self.__free.pop(best)
+        # split the rest of the rectangle along the shorter leftover axis
+        if w - width < h - height:
+            right = (u + width, v, w - width, height)
+            below = (u, v + height, w, h - height)
+        else:
+            right = (u + width, v, w - width, h)
+            below = (u, v + height, width, h - height)
+        for rect in (right, below):
+            if rect[2] > 0 and rect[3] > 0:
+                self.__free.append(rect)
+        return (u, v)
+
+    def _merge_free(self):
+        """join free rectangles that share a full edge"""
+        merged = True
+        while merged:
+            merged = False
+            free = self.__free
+            for i in range(len(free)):
+                u1, v1, w1, h1 = free[i]
+                for j in range(i + 1, len(free)):
+                    u2, v2, w2, h2 = free[j]
+                    if v1 == v2 and h1 == h2 and (u1 + w1 == u2 or u2 + w2 == u1):
+                        free[i] = (min(u1, u2), v1, w1 + w2, h1)
+                    elif u1 == u2 and w1 == w2 and (v1 + h1 == v2 or v2 + h2 == v1):
+                        free[i] = (u1, min(v1, v2), w1, h1 + h2)
+                    else:
+                        continue
+                    del free[j]
+                    merged = True
+                    break
+                if merged:
+                    break
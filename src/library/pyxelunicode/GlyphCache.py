@@ -0,0 +1,146 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+_MAGIC = b'PUGC'
+_VERSION = 1
+# magic, version, mode, size, multipler, sha1 of the font file
+_HEADER = struct.Struct('<4sBcHH20s')
+# key length (utf-8 bytes), width (= advance), height
+_RECORD = struct.Struct('<HHH')
+
+
+def font_hash(font_path: str) -> bytes:
+    """sha1 digest of the font file"""
+    digest = hashlib.sha1()
+    with open(font_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class GlyphCache(object):
+    '''a persistent glyph cache in a memory-mapped file
+
+    The file starts with a header keyed by (font file hash, size, multipler,
+    mode) followed by one record per glyph: the key, its width (which is also
+    the advance) and height, and the bitmap in the GlyphStore row layout
+    (mode '1' rows are packed 8 pixels per byte, most significant bit first;
+    mode 'L' rows are one byte per pixel).
+    Opening maps the file and indexes the records without decoding them,
+    new glyphs are appended to the end. A file written for another font
+    (or size, multipler, mode) is discarded, and a record cut off by a
+    crash is truncated away.
+    '''
+
+    def __init__(self, path: str, font_path: str, size: int, multipler: int, mode: str):
+        """open (or create) the cache file
+        Args:
+            path:
+                cache file, created along with its directory if missing
+            font_path, size, multipler, mode:
+                the PyxelUnicode settings the glyphs were rasterized with
+        """
+        self.path = path
+        self.mode = mode
+        self.header = _HEADER.pack(_MAGIC, _VERSION, mode.encode('ascii'), size, multipler,
+                                   font_hash(font_path))
+        self.__index = {}  # key -> (offset of the bitmap, width, height)
+        self.__map = None
+        self.__file = None
+        self.__lock = threading.Lock()  # glyphs are appended from the prewarm workers
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def _open(self):
+        """map the file and index its records (starting over if it does not match)"""
+        try:
+            with open(self.path, 'rb') as f:
+                valid = f.read(_HEADER.size) == self.header
+        except FileNotFoundError:
+            valid = False
+        if not valid:
+            # new file, or written for another font: invalidate it
+            with open(self.path, 'wb') as f:
+                f.write(self.header)
+        self.__file = open(self.path, 'r+b')
+        end = self._index(mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ))
+        if end < os.fstat(self.__file.fileno()).st_size:
+            # the last record was not written completely
+            self.__map.close()
+            self.__file.truncate(end)
+            self.__index.clear()
+            self._index(mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ))
+        self.__file.seek(0, os.SEEK_END)
+
+    def _index(self, data) -> int:
+        """index the records of the mapped file
+        Returns:
+            offset just after the last complete record
+        """
+        self.__map = data
+        offset = _HEADER.size
+        size = len(data)
+        while offset + _RECORD.size <= size:
+            key_length, width, height = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size + key_length
+            end = start + self._bitmap_size(width, height)
+            if end > size:
+                break
+            key = data[offset + _RECORD.size:start].decode('utf-8')
+            self.__index[key] = (start, width, height)
+            offset = end
+        return offset
+
+    def _bitmap_size(self, width: int, height: int) -> int:
+        if self.mode == '1':
+            return ((width + 7) >> 3) * height
+        return width * height
+
+    def get_packed(self, key):
+        """the glyph as (width, height, packed rows) in the GlyphStore layout
+        Returns:
+            None if the glyph is not cached
+        """
+        with self.__lock:
+            entry = self.__index.get(key)
+            if entry is None or self.__map is None:
+                return None
+            offset, width, height = entry
+            end = offset + self._bitmap_size(width, height)
+            if end > len(self.__map):
+                # appended after the file was mapped
+                self.__map.close()
+                self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            # slicing copies, so the map can still be closed or remapped
+            return width, height, self.__map[offset:end]
+
+    def put_packed(self, key, width: int, height: int, packed):
+        """append a glyph (packed rows in the GlyphStore layout) to the end of the file"""
+        with self.__lock:
+            if key in self.__index or self.__file is None:
+                return
+            encoded = key.encode('utf-8')
+            start = self.__file.tell() + _RECORD.size + len(encoded)
+            self.__file.write(_RECORD.pack(len(encoded), width, height) + encoded + bytes(packed))
+            self.__file.flush()
+            self.__index[key] = (start, width, height)
+
+    def close(self):
+        with self.__lock:
+            if self.__map is not None:
+                self.__map.close()
+                self.__map = None
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
@@ -0,0 +1,131 @@
+class GlyphStore(object):
+    '''all glyphs in one contiguous buffer of packed rows
+
+    Mode '1' rows are packed 8 pixels per byte, most significant bit first
+    (the layout of PIL '1' images and of GlyphCache); mode 'L' rows are one
+    byte per pixel. An index maps each key to (offset, width, height).
+    Accessors return memoryviews of the buffer without copying. The buffer
+    is never resized in place: when it is full the used part is copied into
+    a buffer twice as large, so views handed out earlier stay valid.
+    '''
+
+    def __init__(self, mode: str = '1', capacity: int = 4096):
+        """initialize the store
+        Args:
+            mode: (default='1')
+                '1' (bilevel, 1 bit per pixel) or 'L' (grayscale, 1 byte per pixel)
+            capacity: (default=4096)
+                initial size of the buffer in bytes
+        """
+        self.mode = mode
+        self.__data = bytearray(max(capacity, 1))
+        self.__used = 0
+        self.__index = {}  # key -> (offset, width, height)
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    @property
+    def nbytes(self) -> int:
+        """bytes of glyph data in the buffer"""
+        return self.__used
+
+    def stride(self, width: int) -> int:
+        """bytes per row of a glyph width pixels wide"""
+        if self.mode == '1':
+            return (width + 7) >> 3
+        return width
+
+    def add(self, key, char_data: list):
+        """pack a 2 dim list of pixel values (truthy is lit in mode '1')"""
+        self.add_packed(key, *self.pack(char_data))
+
+    def pack(self, char_data: list) -> tuple:
+        """(width, height, packed rows) of a 2 dim list of pixel values"""
+        height = len(char_data)
+        width = len(char_data[0]) if height else 0
+        stride = self.stride(width)
+        packed = bytearray(stride*height)
+        if self.mode == '1':
+            for y, row in enumerate(char_data):
+                for x, pixel in enumerate(row):
+                    if pixel:
+                        packed[y*stride + (x >> 3)] |= 0x80 >> (x & 7)
+        else:
+            for y, row in enumerate(char_data):
+                packed[y*stride:(y + 1)*stride] = bytes(row)
+        return width, height, packed
+
+    def add_packed(self, key, width: int, height: int, packed):
+        """add a glyph that is already packed in this store's row layout"""
+        size = self.stride(width)*height
+        if len(packed) != size:
+            raise ValueError('packed glyph is %d bytes, expected %d' % (len(packed), size))
+        offset = self.__used
+        data = self.__data
+        if offset + size > len(data):
+            grown = bytearray(max(len(data)*2, offset + size))
+            grown[:offset] = data[:offset]
+            # readers holding the old buffer (or views of it) keep valid bytes
+            self.__data = data = grown
+        data[offset:offset + size] = packed
+        self.__used = offset + size
+        # index last, so the glyph is visible only once its bytes are written
+        self.__index[key] = (offset, width, height)
+
+    def size(self, key):
+        """(width, height) of the glyph, None if it is not stored"""
+        entry = self.__index.get(key)
+        if entry is None:
+            return None
+        return entry[1], entry[2]
+
+    def bitmap(self, key) -> memoryview:
+        """packed rows of the glyph as one memoryview (None if it is not stored)"""
+        entry = self.__index.get(key)
+        if entry is None:
+            return None
+        offset, width, height = entry
+        return memoryview(self.__data)[offset:offset + self.stride(width)*height]
+
+    def rows(self, key) -> list:
+        """memoryview of each packed row of the glyph"""
+        bitmap = self.bitmap(key)
+        if bitmap is None:
+            return None
+        width, height = self.size(key)
+        stride = self.stride(width)
+        return [bitmap[y*stride:(y + 1)*stride] for y in range(height)]
+
+    def lit(self, key):
+        """(x, y, value) of every lit pixel of the glyph"""
+        bitmap = self.bitmap(key)
+        width, height = self.size(key)
+        stride = self.stride(width)
+        if self.mode == '1':
+            for y in range(height):
+                row = y*stride
+                for i in range(stride):
+                    bits = bitmap[row + i]
+                    if not bits:  # skip 8 unlit pixels at once
+                        continue
+                    for x in range(i << 3, min((i + 1) << 3, width)):
+                        if bits & (0x80 >> (x & 7)):
+                            yield x, y, 255
+        else:
+            for y in range(height):
+                row = y*stride
+                for x in range(width):
+                    if bitmap[row + x]:
+                        yield x, y, bitmap[row + x]
+
+    def pixels(self, key) -> list:
+        """the glyph unpacked to a 2 dim list of pixel values (like PyxelUnicode._extract_pixel)"""
+        width, height = self.size(key)
+        result = [[0]*width for _ in range(height)]
+        for x, y, value in self.lit(key):
+            result[y][x] = value
+        return result
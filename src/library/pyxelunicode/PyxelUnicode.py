@@ -1,14 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from ..PIL import Image, ImageFont, ImageDraw
 import pyxel
+from .GlyphAtlas import GlyphAtlas
+from .GlyphCache import GlyphCache
+from .GlyphStore import GlyphStore
 
 
 class PyxelUnicode(object):
     '''a unicode pixel font builder for pyxel
     '''
 
-    def __init__(self, font_path: str, original_size: int, multipler: int = 8, mode: str = '1'):
+    def __init__(self, font_path: str, original_size: int, multipler: int = 8, mode: str = '1',
+                 atlas_bank: int = None, atlas_rect: tuple = None, max_glyphs: int = None,
+                 cache_path: str = None):
         """initialize the class
-        takes 4 parameter to initialize
+        takes 4 parameter to initialize (and optional ones for the atlas and the disk cache)
         Args:
             font_path:  
                 path to TrueTypeFont file (*.ttf)
@@ -20,6 +27,17 @@ class PyxelUnicode(object):
             mode: (default='1')
                 '1' means bilevel
                 'L' means grayscale (not recommanded)
+            atlas_bank: (default=None)
+                pyxel image bank used as a glyph atlas. Each glyph is rasterized
+                into the bank once and drawn with one blt. None means pset mode
+            atlas_rect: (default=None)
+                (u, v, w, h) region of the bank for the atlas, None means the whole bank
+            max_glyphs: (default=None)
+                maximum number of glyphs kept in the atlas (least recently used are evicted)
+            cache_path: (default=None)
+                file to keep rasterized glyphs in across launches (see GlyphCache).
+                Cached glyphs are read from the mapped file instead of rendered,
+                and the file is discarded when the font or these settings change
         """
         self.font_path = font_path
         self.original_size = original_size
@@ -32,8 +50,53 @@ class PyxelUnicode(object):
                 'mode support "1"(bilevel) and "L"(grayscale) only, using defualt("1") setting')
             mode = '1'
         self.mode = mode
-        self.font_height = len(self._extract_pixel('|'))
-        self.__char_info = {}
+        # the TTF is parsed once per thread (on first render), glyphs are rendered
+        # on a reusable scratch canvas
+        self.__local = threading.local()
+        self.cache = None
+        if cache_path is not None:
+            self.cache = GlyphCache(cache_path, font_path, original_size, multipler, mode)
+        # every glyph, bit-packed in one buffer
+        self.glyphs = GlyphStore(mode)
+        # background rasterization (see prewarm)
+        self.__lock = threading.Lock()
+        self.__pending = {}  # char -> Future
+        self.__pool = None
+        self.font_height = 0
+        self.font_height = self._get_char('|')[1]
+        self.atlas = None
+        if atlas_bank is not None:
+            self.atlas = GlyphAtlas(atlas_bank, atlas_rect, max_glyphs)
+
+    @property
+    def font(self):
+        """the FreeTypeFont of the calling thread (loaded on first use)"""
+        return self._thread_font()
+
+    def _thread_font(self):
+        """the FreeTypeFont of the calling thread (FreeType faces are not thread-safe)"""
+        local = self.__local
+        font = getattr(local, 'font', None)
+        if font is None:
+            font = local.font = ImageFont.truetype(
+                self.font_path, self.original_size*self.multipler)
+            local.canvas = None
+            local.canvas_draw = None
+            self._grow_canvas(1, 1)
+        return font
+
+    def _grow_canvas(self, width: int, height: int):
+        """make sure the scratch canvas of the calling thread is at least width x height"""
+        local = self.__local
+        canvas = local.canvas
+        if canvas is not None and canvas.width >= width and canvas.height >= height:
+            return
+        if canvas is not None:
+            width = max(width, canvas.width)
+            height = max(height, canvas.height)
+        # grayscale like the RGB canvas this used to draw on (antialiased, then converted)
+        local.canvas = Image.new('L', (width, height), 0)
+        local.canvas_draw = ImageDraw.Draw(local.canvas)
 
     def _extract_pixel(self, char: str) -> list:
         """Extract pixel information of the unicode charactor
@@ -43,38 +106,170 @@ class PyxelUnicode(object):
         Returns:
             2 dim list of grayscale value
         """
-        # get fontsize
-        font = ImageFont.truetype(
-            self.font_path, self.original_size*self.multipler)
-        # dummy image for get text_size
-        tmp = Image.new('RGB', (1, 1), (0, 0, 0))
-        tmp_d = ImageDraw.Draw(tmp)
-        bbox = tmp_d.textbbox((0, 0), char, font=font)
+        font = self._thread_font()
+        local = self.__local
+        # the canvas draw doubles as the measuring surface
+        bbox = local.canvas_draw.textbbox((0, 0), char, font=font)
         width = bbox[2] - bbox[0]
         height = bbox[3] - bbox[1]
-
-        # background: transparent
-        img = Image.new('RGB', (width, height), (0, 0, 0))
-        img_d = ImageDraw.Draw(img)
-        img_d.text((0, 0), char, font=font)
-        # convert it to bilevel or grayscale image
-        img = img.convert(self.mode)
-        data = list(img.getdata())
         output_width = width//self.multipler
         output_height = height//self.multipler
-        result = [[0]*(output_width) for _ in range(output_height)]
+        if output_width <= 0 or output_height <= 0:
+            return [[] for _ in range(max(output_height, 0))]
+
+        # background: transparent
+        self._grow_canvas(width, height)
+        box = (0, 0, width, height)
+        local.canvas.paste(0, box)
+        local.canvas_draw.text((0, 0), char, font=font, fill=255)
+        # convert it to bilevel or grayscale image (the crop keeps the dithering identical)
+        img = local.canvas.crop(box).convert(self.mode)
+        data = img.tobytes()
         p_offset = self.multipler >> 1  # color picker offset
-        for i in range(output_height):
-            for j in range(output_width):
-                y = i*self.multipler
-                x = j*self.multipler
-                # calculate one dimension index in image data
-                one_dim_idx = (y+p_offset)*width + x+p_offset
-                result[i][j] = data[one_dim_idx]
+        columns = range(p_offset, p_offset + output_width*self.multipler, self.multipler)
+        result = []
+        if self.mode == '1':
+            # rows are packed 8 pixels per byte, most significant bit first
+            stride = (width + 7) >> 3
+            picks = [(x >> 3, 0x80 >> (x & 7)) for x in columns]
+            for i in range(output_height):
+                row = (i*self.multipler + p_offset)*stride
+                result.append([255 if data[row + byte] & bit else 0
+                               for byte, bit in picks])
+        else:
+            stop = p_offset + output_width*self.multipler
+            for i in range(output_height):
+                row = (i*self.multipler + p_offset)*width
+                result.append(list(data[row + p_offset:row + stop:self.multipler]))
         return result
 
-    def text(self, x: int, y: int, text: str, color: int = 7, bg_color: int = None):
+    def _get_char(self, char: str) -> tuple:
+        """(width, height) of the charactor, extracted into the glyph store on first use
+        Once prewarm has been called an unseen charactor is queued to the
+        background workers instead, and None is returned until it is ready.
+        """
+        size = self.glyphs.size(char)
+        if size is None:
+            # reading the disk cache is cheap enough to never defer
+            if self.__pool is not None and (self.cache is None or char not in self.cache):
+                self._submit(char)
+                return None
+            size = self._load_char(char)
+        return size
+
+    def _load_char(self, char: str) -> tuple:
+        """put the glyph into the store from the disk cache, or rendered"""
+        packed = self.cache.get_packed(char) if self.cache is not None else None
+        if packed is None:
+            packed = self._render(char)
+        return self._publish(char, *packed)
+
+    def _render(self, char: str) -> tuple:
+        """rasterize the charactor and append it to the disk cache
+        Returns:
+            (width, height, packed rows)
+        """
+        packed = self.glyphs.pack(self._extract_pixel(char))
+        if self.cache is not None:
+            self.cache.put_packed(char, *packed)
+        return packed
+
+    def _publish(self, char: str, width: int, height: int, packed) -> tuple:
+        """put an extracted glyph into the glyph store"""
+        with self.__lock:
+            # update the font_height before the glyph becomes visible
+            self.font_height = max(height, self.font_height)
+            if char not in self.glyphs:
+                self.glyphs.add_packed(char, width, height, packed)
+            self.__pending.pop(char, None)
+        return width, height
+
+    def _submit(self, char: str):
+        """queue the charactor to the background workers (once)"""
+        with self.__lock:
+            if char in self.glyphs or char in self.__pending:
+                return self.__pending.get(char)
+            if self.__pool is None:  # shut down meanwhile
+                return None
+            future = self.__pool.submit(self._rasterize, char)
+            self.__pending[char] = future
+            return future
+
+    def _rasterize(self, char: str) -> list:
+        """extract and publish a glyph (runs in a worker thread)"""
+        try:
+            return self._publish(char, *self._render(char))
+        except Exception:
+            with self.__lock:
+                self.__pending.pop(char, None)
+            raise
+
+    def prewarm(self, charset, workers: int = 1) -> list:
+        """rasterize characters in background threads so that drawing never stalls
+        Glyphs appear in the glyph store one by one as they finish; text()
+        and draw_char() skip the ones that are not ready yet. After the first
+        call every unseen charactor is rasterized in the background as well.
+        Args:
+            charset:
+                a string, or an iterable of strings (e.g. every string of a screen)
+            workers: (default=1)
+                number of worker threads, only used by the first call
+                (PIL holds the GIL while rendering text, so more threads rarely help)
+        Returns:
+            list of futures of the queued characters (concurrent.futures.wait them
+            to block until the glyphs are ready, e.g. on a loading screen)
+        """
+        if self.__pool is None:
+            with self.__lock:
+                if self.__pool is None:
+                    self.__pool = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix='pyxelunicode')
+        if isinstance(charset, str):
+            charset = (charset,)
+        futures = []
+        seen = set()
+        for string in charset:
+            for char in string:
+                if char and char not in seen:
+                    seen.add(char)
+                    if self.cache is not None and char not in self.glyphs and char in self.cache:
+                        self._load_char(char)
+                        continue
+                    future = self._submit(char)
+                    if future is not None:
+                        futures.append(future)
+        return futures
+
+    def ready(self, text) -> bool:
+        """True if every charactor of the string has been rasterized"""
+        return all(char in self.glyphs for char in text if char)
+
+    @property
+    def pending(self) -> int:
+        """number of characters waiting for the background workers"""
+        return len(self.__pending)
+
+    def shutdown(self, wait: bool = True):
+        """stop the background workers (unseen characters are extracted synchronously again)"""
+        with self.__lock:
+            pool = self.__pool
+            self.__pool = None
+            queued = list(self.__pending.values())
+        if pool is not None:
+            if not wait:
+                # drop the queued characters (shutdown(cancel_futures=True) needs Python 3.9)
+                for future in queued:
+                    future.cancel()
+            pool.shutdown(wait=wait)
+        if not wait:
+            with self.__lock:
+                self.__pending = {char: future for char, future in self.__pending.items()
+                                  if not future.done()}
+
+    def text(self, x: int, y: int, text: str, color: int = 7, bg_color: int = None, target=pyxel):
         """unicode text painter (just like pyxel.text())
+        In atlas mode each glyph is one blt with the palette remapped to color.
+        Characters still being rasterized in the background (see prewarm) are skipped.
         Args:
             x, y:
                 x,y-coordinate
@@ -85,19 +280,32 @@ class PyxelUnicode(object):
                 Foreground color of the string
             bg_color: (default=None)
                 Background color of the string
+            target: (default=pyxel)
+                where to draw, the screen or a pyxel.Image
         """
+        # 文字が空の場合やNoneの場合をスキップ
+        glyphs = [(c, self._get_char(c)) for c in text if c]
+        # 文字のサイズチェックを追加（バックグラウンドで作成中の文字も飛ばす）
+        glyphs = [(c, size) for c, size in glyphs if size and size[0] and size[1]]
+        if bg_color is not None and glyphs:
+            # one rect behind the whole string (drawn before the palette is remapped)
+            target.rect(x, y, sum(width for _, (width, _) in glyphs),
+                        max(height for _, (_, height) in glyphs), bg_color)
+        atlas = self.atlas
+        if atlas is not None:
+            target.pal(GlyphAtlas.INK, color)
         cur_x = x
-        for c in text:
-            # 文字が空の場合やNoneの場合をスキップ
-            if not c:
-                continue
-            # 文字のサイズチェックを追加
-            char_data = self.__char_info.get(c)
-            if char_data and len(char_data) > 0:
-                cur_x += len(char_data[0])
-                self.draw_char(cur_x, y, c, color, bg_color)
-
-    def draw_char(self, x: int, y: int, char: str, color: int, bg_color: int = None):
+        for c, (width, _) in glyphs:
+            self._draw_glyph(cur_x, y, c, color, target)
+            cur_x += width
+        if atlas is not None:
+            target.pal()
+
+    def text_width(self, text: str) -> int:
+        """width of the string in pixels (characters that are not ready count as 0)"""
+        return sum(size[0] for size in map(self._get_char, filter(None, text)) if size)
+
+    def draw_char(self, x: int, y: int, char: str, color: int, bg_color: int = None, target=pyxel):
         """Draw a single character at the specified position
         Args:
             x, y:
@@ -108,19 +316,31 @@ class PyxelUnicode(object):
                 foreground color
             bg_color:
                 background color
+            target: (default=pyxel)
+                where to draw, the screen or a pyxel.Image
         """
-        if char not in self.__char_info:
-            # update the character table
-            self.__char_info[char] = self._extract_pixel(char)
-            # update the font_height
-            self.font_height = max(
-                len(self.__char_info[char]), self.font_height)
-        char_data = self.__char_info[char]
-        for row in range(len(char_data)):
-            for col in range(len(char_data[0])):
-                if char_data[row][col]:
-                    pyxel.pset(x+col, y+row, color)
-                if bg_color is not None:
-                    pyxel.pset(x+col, y+row, bg_color)
+        size = self._get_char(char)
+        if not size or not size[0] or not size[1]:
+            return
+        if bg_color is not None:
+            target.rect(x, y, size[0], size[1], bg_color)
+        if self.atlas is not None:
+            target.pal(GlyphAtlas.INK, color)
+            self._draw_glyph(x, y, char, color, target)
+            target.pal()
+        else:
+            self._draw_glyph(x, y, char, color, target)
 
+    def _draw_glyph(self, x: int, y: int, char: str, color: int, target=pyxel):
+        """draw the glyph (atlas mode expects INK to be remapped to color)"""
+        if self.atlas is not None and self.atlas.draw(x, y, char, self.glyphs, target):
+            return
+        # pset mode, or the glyph does not fit in the atlas
+        for col, row, _ in self.glyphs.lit(char):
+            target.pset(x+col, y+row, color)
 
+    def close(self):
+        """stop the background workers and close the disk cache (call on exit)"""
+        self.shutdown(wait=False)
+        if self.cache is not None:
+            self.cache.close()
@@ -1,9 +1,76 @@
-from game import Game
+from startup import StartupTracer
+
+# 起動時間の計測の起点（ゲーム本体の import は main の中で行う）
+tracer = StartupTracer()
+
+import argparse
+import re
+
+def parse_size(text: str):
+    match = re.fullmatch(r"(\d+)x(\d+)", text)
+    if not match:
+        raise argparse.ArgumentTypeError("size must be WIDTHxHEIGHT (e.g. 240x300)")
+    return int(match.group(1)), int(match.group(2))
 
 def main():
-    # ウィンドウサイズを調整（横幅を広げる）
-    game = Game(240, 300)  # 元: 200, 180
+    parser = argparse.ArgumentParser(description="E Card")
+    # ウィンドウサイズを調整（横幅を広げる）元: 200x180
+    parser.add_argument("--size", type=parse_size, default=(240, 300),
+                        help="論理解像度 WIDTHxHEIGHT（レイアウトはこの大きさで計算する）")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="論理解像度の画面を整数倍に拡大して表示する（大きな画面向け）")
+    parser.add_argument("--cpu", choices=("basic", "mcts"), default="basic",
+                        help="対戦相手の CPU の戦略（mcts はモンテカルロ木探索で考える）")
+    parser.add_argument("--replay", metavar="FILE", help="記録した試合 (*.ecr) を再生する")
+    parser.add_argument("--speed", type=float, default=1.0, help="リプレイの再生速度（倍速）")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="変化した範囲だけでなく毎フレーム画面全体を描き直す")
+    parser.add_argument("--draw-stats", action="store_true", help="1フレームの描画呼び出しの数を表示する")
+    parser.add_argument("--profile", metavar="CSV", nargs="?", const="profile.csv",
+                        help="フレーム時間のグラフを表示し、終了時に CSV に書き出す")
+    parser.add_argument("--fixed-step", action="store_true",
+                        help="状態を固定の tick で進め、描画が遅れたフレームは描画を飛ばす")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="固定タイムステップで状態を進める速さ（倍速、--fixed-step と併用）")
+    parser.add_argument("--demo", action="store_true", help="CPU 同士の対戦を繰り返すデモを表示する")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="import と初期化の時間の内訳を最初のフレームの後に表示する")
+    parser.add_argument("--exit-after-first-frame", action="store_true",
+                        help="最初のフレームを描いたら終了する（起動時間のベンチマーク用）")
+    args = parser.parse_args()
+
+    if args.trace_startup:
+        tracer.install()
+    with tracer.phase("import game"):
+        import pyxel
+        from game import Game
+        from match_log import MatchRecord
+
+    width, height = args.size
+    with tracer.phase("Game.__init__"):
+        game = Game(width, height, max(1, args.scale))
+    game.cpu = args.cpu
+    game.scene.enabled = not args.full_redraw
+    if args.draw_stats:
+        game.enable_draw_stats()
+    if args.profile:
+        game.enable_profiler(args.profile)
+    if args.fixed_step or args.time_scale != 1.0:
+        game.enable_fixed_timestep(args.time_scale)
+    if args.demo:
+        game.start_demo()
+    elif args.replay:
+        game.start_replay(MatchRecord.load(args.replay), args.speed)
+
+    def on_first_frame():
+        if args.trace_startup:
+            tracer.uninstall()
+            tracer.report()
+        if args.exit_after_first_frame:
+            print(f"first_frame_ms={tracer.first_frame * 1000:.3f}", flush=True)
+            pyxel.quit()
+    tracer.watch_first_frame(game, on_first_frame)
     game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,69 @@
+"""1試合分のイベントログ（リプレイ用）
+
+seed、init_cards で配った手札の並び順（順列）、各ターンに両者が出したカードの位置を記録する。
+ログだけで試合を完全に再現できるため、動画を保存せずに不具合報告の再現や回帰テスト用の
+コーパス作成ができる。バイナリ形式では順列・1ターンともに1バイトで保存する。
+"""
+
+import itertools
+import struct
+from typing import List, Optional, Tuple
+
+DEAL_SIZE = 5  # 1陣営の手札の枚数（特殊カード1枚 + 市民4枚）
+
+_MAGIC = b"ECRP"
+_VERSION = 1
+# magic, version, flags, total_battles, seed, 配布の数, ターンの数
+_HEADER = struct.Struct("<4sBBBQBH")
+_FLAG_HAS_SEED = 1
+MAX_SEED = (1 << 64) - 1  # 記録できる seed の最大値（0〜MAX_SEED の整数をそのまま保存する）
+
+# 5枚の並び順は 5! = 120 通りなので番号1バイトで表せる
+_PERMUTATIONS = list(itertools.permutations(range(DEAL_SIZE)))
+_PERMUTATION_INDEX = {permutation: i for i, permutation in enumerate(_PERMUTATIONS)}
+
+class MatchRecord:
+    """1試合分のイベントログ"""
+
+    def __init__(self, seed: Optional[int] = None, total_battles: int = 6):
+        self.seed = seed
+        self.total_battles = total_battles
+        self.deals: List[Tuple[int, ...]] = []  # init_cards ごとの並び順（配った順）
+        self.moves: List[Tuple[int, int]] = []  # ターンごとの (プレイヤー, CPU) のカードの位置
+
+    def to_bytes(self) -> bytes:
+        if self.seed is not None and not 0 <= self.seed <= MAX_SEED:
+            # 丸めて保存すると別の seed として読み込まれてしまうので、保存できない値は受け付けない
+            raise ValueError(f"seed {self.seed} does not fit in a match record (0 to {MAX_SEED})")
+        flags = _FLAG_HAS_SEED if self.seed is not None else 0
+        header = _HEADER.pack(_MAGIC, _VERSION, flags, self.total_battles, self.seed or 0,
+                              len(self.deals), len(self.moves))
+        deals = bytes(_PERMUTATION_INDEX[deal] for deal in self.deals)
+        moves = bytes((player << 4) | ai for player, ai in self.moves)
+        return header + deals + moves
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MatchRecord":
+        if len(data) < _HEADER.size:
+            raise ValueError("match record is truncated")
+        magic, version, flags, total_battles, seed, num_deals, num_moves = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a match record")
+        if len(data) != _HEADER.size + num_deals + num_moves:
+            raise ValueError("match record is truncated")
+
+        record = cls(seed if flags & _FLAG_HAS_SEED else None, total_battles)
+        offset = _HEADER.size
+        record.deals = [_PERMUTATIONS[i] for i in data[offset:offset + num_deals]]
+        offset += num_deals
+        record.moves = [(move >> 4, move & 0xF) for move in data[offset:offset + num_moves]]
+        return record
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "MatchRecord":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
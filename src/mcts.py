@@ -0,0 +1,170 @@
+"""モンテカルロ木探索（MCTS）で出すカードを選ぶ CPU
+
+相手の手札は見えないため、毎回の探索で「これまでに相手が出したカード」と矛盾しない
+手札を1つ仮定（determinization）してからプレイアウトする。
+両者が同時にカードを出すゲームなので、木の各ノードでは自分と相手の手の統計を別々に持ち、
+それぞれが UCB1 で独立に手を選ぶ（decoupled UCT）。
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from card import Card, CardType, judge, DRAW
+from hand import Hand
+from player import AIPlayer
+
+CITIZENS = 4  # 1バトルの市民の枚数
+DEFAULT_TIME_BUDGET = 0.008  # 1手あたりの思考時間（60fps の1フレーム 16.7ms に収まるように）
+EXPLORATION = 1.4  # UCB1 の探索係数
+CLOCK_CHECK_INTERVAL = 16  # 時刻を確認する反復の間隔
+
+class _Node:
+    """探索木のノード（自分と相手の手ごとの [訪問回数, 報酬の合計]）"""
+
+    __slots__ = ("visits", "own_stats", "opponent_stats", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.own_stats: Dict[CardType, List[float]] = {}
+        self.opponent_stats: Dict[CardType, List[float]] = {}
+        self.children: Dict[Tuple[CardType, CardType], "_Node"] = {}
+
+    def select(self, stats: Dict[CardType, List[float]], moves: Tuple[CardType, ...]) -> CardType:
+        """UCB1 で手を選ぶ（未訪問の手を優先）"""
+        best_move = moves[0]
+        best_score = -math.inf
+        log_visits = math.log(self.visits + 1)
+        for move in moves:
+            stat = stats.get(move)
+            if stat is None or stat[0] == 0:
+                return move
+            score = stat[1] / stat[0] + EXPLORATION * math.sqrt(log_visits / stat[0])
+            if score > best_score:
+                best_move = move
+                best_score = score
+        return best_move
+
+    def update(self, own_move: CardType, opponent_move: CardType, reward: float):
+        self.visits += 1
+        own_stat = self.own_stats.setdefault(own_move, [0, 0.0])
+        own_stat[0] += 1
+        own_stat[1] += reward
+        opponent_stat = self.opponent_stats.setdefault(opponent_move, [0, 0.0])
+        opponent_stat[0] += 1
+        opponent_stat[1] -= reward
+
+class MCTSPlayer(AIPlayer):
+    """MCTS で出すカードを選ぶ CPU
+
+    time_budget 秒（壁時計）で探索を打ち切るため、Game.update の1フレームを超えて止まらない。
+    iterations を指定すると反復回数で打ち切る（探索結果が時間に依存しなくなる）。
+    同じバトルの間は探索木を引き継ぎ、前のターンの探索結果を再利用する。
+    """
+
+    def __init__(self, name: str, rng: Optional[random.Random] = None,
+                 time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+                 iterations: Optional[int] = None):
+        super().__init__(name, rng)
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.root: Optional[_Node] = None
+        self.battle_opponent_cards: List[CardType] = []  # このバトルで相手が出したカード
+        self.last_iterations = 0  # 直前の思考での反復回数
+
+    def observe_turn(self, own_card: Card, opponent_card: Card):
+        super().observe_turn(own_card, opponent_card)
+        if judge(own_card.card_type, opponent_card.card_type) != DRAW:
+            # バトル終了: 次のバトルは新しい木で探索する
+            self.root = None
+            self.battle_opponent_cards = []
+            return
+        self.battle_opponent_cards.append(opponent_card.card_type)
+        # 実際に出た手の子ノードを次のターンの根として再利用
+        if self.root is not None:
+            self.root = self.root.children.get((own_card.card_type, opponent_card.card_type))
+
+    def choose_card_index(self) -> int:
+        # 別スレッドで思考中に根や手札が差し替えられても影響しないよう、参照を固定して探索する
+        hand = self.hand
+        shown = tuple(self.battle_opponent_cards)
+        if len(hand.legal_moves()) == 1:
+            return 0
+
+        root = self.root
+        if root is None:
+            root = self.root = _Node()
+        self.search(root, hand, shown)
+
+        # 同時手番のゲームなので、訪問回数に比例した混合戦略で手を選ぶ
+        moves = list(root.own_stats)
+        weights = [root.own_stats[move][0] for move in moves]
+        move = self.rng.choices(moves, weights)[0]
+        return hand.index(move)
+
+    def search(self, root: _Node, hand: Hand, shown: Tuple[CardType, ...] = ()):
+        """時間（または反復回数）の上限まで探索する"""
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        count = 0
+        while True:
+            self._iterate(root, hand, self._determinize(hand, shown))
+            count += 1
+            if self.iterations is not None and count >= self.iterations:
+                break
+            if (deadline is not None and count % CLOCK_CHECK_INTERVAL == 0
+                    and time.perf_counter() >= deadline):
+                break
+        self.last_iterations = count
+
+    def _determinize(self, hand: Hand, shown: Tuple[CardType, ...]) -> Hand:
+        """相手がこのバトルで出したカード shown と矛盾しない相手の手札を1つ仮定する"""
+        special = CardType.SLAVE if hand.count(CardType.EMPEROR) else CardType.EMPEROR
+        cards = [special] + [CardType.CITIZEN] * CITIZENS
+        for card_type in shown:
+            cards.remove(card_type)
+        self.rng.shuffle(cards)
+        return Hand.from_types(cards)
+
+    def _iterate(self, root: _Node, own_hand: Hand, opponent_hand: Hand):
+        path = []
+        node = root
+        while True:
+            own_move = node.select(node.own_stats, own_hand.legal_moves())
+            opponent_move = node.select(node.opponent_stats, opponent_hand.legal_moves())
+            path.append((node, own_move, opponent_move))
+            own_hand = own_hand.remove(own_move)
+            opponent_hand = opponent_hand.remove(opponent_move)
+
+            reward = judge(own_move, opponent_move)
+            if reward != DRAW:
+                break
+            child = node.children.get((own_move, opponent_move))
+            if child is None:
+                # 木を1ノード広げ、その先はランダムなプレイアウトで評価
+                node.children[(own_move, opponent_move)] = _Node()
+                reward = self._rollout(own_hand, opponent_hand)
+                break
+            node = child
+
+        for node, own_move, opponent_move in path:
+            node.update(own_move, opponent_move, reward)
+
+    def _rollout(self, own_hand: Hand, opponent_hand: Hand) -> int:
+        """両者が手札からランダムに出し合って決着まで進める"""
+        while len(own_hand) and len(opponent_hand):
+            own_index = self.rng.randrange(len(own_hand))
+            opponent_index = self.rng.randrange(len(opponent_hand))
+            reward = judge(own_hand.type_at(own_index), opponent_hand.type_at(opponent_index))
+            if reward != DRAW:
+                return reward
+            own_hand = own_hand.remove_at(own_index)
+            opponent_hand = opponent_hand.remove_at(opponent_index)
+        return DRAW
+
+class FixedIterationMCTSPlayer(MCTSPlayer):
+    """反復回数を固定した MCTS（壁時計に依存しないため総当たり戦の結果を再現できる）"""
+
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
+        super().__init__(name, rng, time_budget=None, iterations=300)
@@ -0,0 +1,136 @@
+"""プレイヤーの癖を学習する相手モデル
+
+プレイヤーが「どの陣営で、何ターン目に」皇帝/奴隷を出したかを数える頻度表。
+1手ごとの更新は配列の1要素を加算するだけ（O(1)）で、セッションをまたいで
+小さなバイナリファイルに保存する。CPU はこの表から相手が特殊カードを出す確率を見積もり、
+その裏をかく手に寄せる。
+"""
+
+import os
+import random
+import struct
+import sys
+from array import array
+from typing import Optional
+from card import CardType, judge, DRAW
+from hand import Hand
+
+MAX_TURNS = 5  # 1バトルの最大ターン数
+_SIDES = 2  # 0: 皇帝側, 1: 奴隷側
+_KINDS = 2  # 0: 特殊カード（皇帝/奴隷）, 1: 市民
+
+_MAGIC = b"ECOM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH")
+
+PRIOR_STRENGTH = 2.0  # 事前分布（ランダムに出した場合）の重み（観測何回分か）
+CONFIDENCE_SCALE = 10.0  # 観測数がこの値のとき、半分の確率でモデルの手を採用する
+
+class OpponentModel:
+    """陣営・ターンごとに特殊カードを出した回数を数える頻度表"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # counts[(side * MAX_TURNS + turn - 1) * 2 + kind]
+        self.counts = array("I", bytes(4 * _SIDES * MAX_TURNS * _KINDS))
+        self.dirty = False
+
+    @staticmethod
+    def _index(is_emperor: bool, turn: int, kind: int) -> int:
+        return ((0 if is_emperor else 1) * MAX_TURNS + turn - 1) * _KINDS + kind
+
+    def observe(self, is_emperor: bool, turn: int, card_type: CardType):
+        """相手が turn ターン目に card_type を出したことを記録する（O(1)）"""
+        if not 1 <= turn <= MAX_TURNS:
+            return
+        kind = 1 if card_type == CardType.CITIZEN else 0
+        self.counts[self._index(is_emperor, turn, kind)] += 1
+        self.dirty = True
+
+    def observations(self, is_emperor: bool, turn: int) -> int:
+        index = self._index(is_emperor, turn, 0)
+        return self.counts[index] + self.counts[index + 1]
+
+    def special_probability(self, is_emperor: bool, turn: int, cards_left: int) -> float:
+        """相手が turn ターン目に特殊カードを出す確率の見積もり
+
+        観測が少ないうちは、残り cards_left 枚からランダムに出す場合の確率に寄せる。
+        """
+        index = self._index(is_emperor, turn, 0)
+        prior = 1.0 / max(1, cards_left)
+        specials = self.counts[index] + PRIOR_STRENGTH * prior
+        return specials / (self.counts[index] + self.counts[index + 1] + PRIOR_STRENGTH)
+
+    def suggest(self, hand: Hand, rng: random.Random) -> Optional[CardType]:
+        """相手の傾向に対して期待値が最も高いカードの種類（使わない場合は None）
+
+        観測が多いほど高い確率でモデルの手を採用し、それ以外は None を返して
+        呼び出し側の通常の戦略に任せる。
+        """
+        if len(hand.legal_moves()) < 2:
+            return None
+        own_special = CardType.EMPEROR if hand.count(CardType.EMPEROR) else CardType.SLAVE
+        opponent_special = CardType.SLAVE if own_special == CardType.EMPEROR else CardType.EMPEROR
+        opponent_is_emperor = opponent_special == CardType.EMPEROR
+        turn = MAX_TURNS + 1 - len(hand)
+
+        observed = self.observations(opponent_is_emperor, turn)
+        if rng.random() >= observed / (observed + CONFIDENCE_SCALE):
+            return None
+
+        p = self.special_probability(opponent_is_emperor, turn, len(hand))
+        continuation = _continuation_value(own_special, len(hand) - 2)
+        best_move = None
+        best_value = None
+        for move in hand.legal_moves():
+            value = 0.0
+            for opponent_move, probability in ((opponent_special, p), (CardType.CITIZEN, 1.0 - p)):
+                outcome = judge(move, opponent_move)
+                value += probability * (continuation if outcome == DRAW else outcome)
+            if best_value is None or value > best_value:
+                best_move = move
+                best_value = value
+        return best_move
+
+    @classmethod
+    def load(cls, path: str) -> "OpponentModel":
+        """保存済みのモデルを読み込む（無い・壊れている場合は空のモデル）"""
+        model = cls(path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return model
+        if len(data) != _HEADER.size + len(model.counts) * 4:
+            return model
+        magic, version = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            return model
+        counts = array("I")
+        counts.frombytes(data[_HEADER.size:])
+        if sys.byteorder == "big":
+            counts.byteswap()  # ファイルはリトルエンディアン
+        model.counts = counts
+        return model
+
+    def save(self, path: Optional[str] = None):
+        """モデルを保存する（変更がなければ何もしない）"""
+        path = path or self.path
+        if path is None or not self.dirty:
+            return
+        counts = array("I", self.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION))
+            f.write(counts.tobytes())
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+def _continuation_value(own_special: CardType, citizens_after_draw: int) -> float:
+    """市民同士で引き分けた後の状態の値（自分から見た均衡値）"""
+    from solver import equilibrium_table  # 初めて必要になったときに均衡表を計算する
+    value = float(equilibrium_table()[(citizens_after_draw, citizens_after_draw)].value)
+    return value if own_special == CardType.EMPEROR else -value
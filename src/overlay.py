@@ -0,0 +1,33 @@
+"""半透明のモーダル用レイヤー（ディザリングのオーバーレイ）
+
+市松模様のディザリングをオフスクリーンの pyxel.Image に一度だけ描いておき、
+毎フレームは透明色付きの blt 1回で画面に重ねる。
+画素ごとに pyxel.pset を呼ぶ（240x300 で毎フレーム 36,000 回）のに比べて桁違いに軽い。
+"""
+
+import pyxel
+
+class DitherOverlay:
+    """画面全体に重ねる市松模様の半透明レイヤー"""
+
+    def __init__(self, width: int, height: int, col: int = 0):
+        self.width = width
+        self.height = height
+        self.col = col
+        # 透明にする色（模様の色と重ならなければ何でもよい）
+        self.colkey = 1 if col == 0 else 0
+        self.image = pyxel.Image(width, height)
+        # (x + y) が偶数の画素を col で塗り、残りは透明色にする
+        even = f"{col:x}{self.colkey:x}" * ((width + 1) // 2)
+        odd = f"{self.colkey:x}{col:x}" * ((width + 1) // 2)
+        self.image.set(0, 0, [(even if y % 2 == 0 else odd)[:width] for y in range(height)])
+
+    def draw(self, x: int = 0, y: int = 0, w: int = None, h: int = None, target=pyxel):
+        """画面の (x, y, w, h) の範囲を暗くする（省略時は画面全体）
+
+        模様は画面座標に揃えて切り出すので、どの範囲に重ねても継ぎ目が出ない。
+        target には pyxel の代わりに描画先（Game.gfx など）を渡せる。
+        """
+        w = self.width - x if w is None else w
+        h = self.height - y if h is None else h
+        target.blt(x, y, self.image, x, y, w, h, self.colkey)
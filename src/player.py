@@ -1,5 +1,6 @@
-from typing import List
+from typing import Optional
 from card import Card, CardType
+from hand import Hand, CARDS
 import random
 from enum import Enum
 
@@ -11,67 +12,90 @@ class Player:
     def __init__(self, name: str, player_type: PlayerType):
         self.name = name
         self.player_type = player_type
-        self.hand: List[Card] = []
+        self.hand = Hand()
         self.score = 0
         
     def init_hand(self):
         # 手札の初期化（市民4枚、皇帝1枚、奴隷1枚）
-        self.hand = [
-            Card(CardType.CITIZEN) for _ in range(4)
-        ]
-        self.hand.append(Card(CardType.EMPEROR))
-        self.hand.append(Card(CardType.SLAVE))
+        self.hand = Hand.from_types(
+            [CardType.CITIZEN] * 4 + [CardType.EMPEROR, CardType.SLAVE]
+        )
         
     def select_card(self, index: int) -> Card:
         if 0 <= index < len(self.hand):
-            return self.hand.pop(index)
+            card_type = self.hand.type_at(index)
+            self.hand = self.hand.remove_at(index)
+            return CARDS[card_type]
         return None
         
     def get_hand_size(self) -> int:
         return len(self.hand)
 
 class AIPlayer(Player):
-    def __init__(self, name: str):
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
         super().__init__(name, PlayerType.AI)
         self.opponent_played_cards = []
+        # 乱数生成器（seed 付きで渡すと選択を再現できる）
+        self.rng = rng if rng is not None else random.Random()
+        # 相手の癖を学習するモデル（opponent_model.OpponentModel, 使わない場合は None）
+        self.opponent_model = None
+        
+    def observe_turn(self, own_card: Card, opponent_card: Card):
+        """1ターンの結果を受け取る（相手が出したカードを記録）"""
+        self.opponent_played_cards.append(opponent_card)
+        if self.opponent_model is not None:
+            # 自分のカードは既に手札から除かれているので、残り枚数からターン数が分かる
+            turn = 5 - len(self.hand)
+            opponent_is_emperor = not (own_card.card_type == CardType.EMPEROR
+                                       or self.hand.count(CardType.EMPEROR) > 0)
+            self.opponent_model.observe(opponent_is_emperor, turn, opponent_card.card_type)
         
     def select_card_ai(self) -> Card:
         if len(self.hand) == 0:
             return None
-            
+        return self.select_card(self.choose_card_index())
+        
+    def choose_card_index(self) -> int:
+        """出すカードの位置を決める（手札は変更しないため別スレッドからも呼べる）"""
+        # 相手の傾向が分かっていれば、その裏をかくカードに寄せる
+        if self.opponent_model is not None:
+            card_type = self.opponent_model.suggest(self.hand, self.rng)
+            if card_type is not None:
+                return self.hand.index(card_type)
+        
         # 基本戦略の実装
-        emperor_count = sum(1 for card in self.hand if card.card_type == CardType.EMPEROR)
-        slave_count = sum(1 for card in self.hand if card.card_type == CardType.SLAVE)
-        citizen_count = sum(1 for card in self.hand if card.card_type == CardType.CITIZEN)
+        emperor_count = self.hand.count(CardType.EMPEROR)
+        slave_count = self.hand.count(CardType.SLAVE)
+        citizen_count = self.hand.count(CardType.CITIZEN)
         
         # 最後の1枚は選択の余地なし
         if len(self.hand) == 1:
-            return self.select_card(0)
+            return 0
         
         # ランダム要素を導入（30%の確率で完全ランダム選択）
-        if random.random() < 0.3:
-            index = random.randint(0, len(self.hand) - 1)
-            return self.select_card(index)
+        if self.rng.random() < 0.3:
+            return self.rng.randint(0, len(self.hand) - 1)
         
         # 残りの70%は状況に応じた選択
         available_indices = []
         
         # 市民カードがある場合、50%の確率で市民を使用
-        if citizen_count > 0 and random.random() < 0.5:
-            for i, card in enumerate(self.hand):
-                if card.card_type == CardType.CITIZEN:
-                    available_indices.append(i)
+        if citizen_count > 0 and self.rng.random() < 0.5:
+            available_indices = self.hand.indices_of(CardType.CITIZEN)
         
         # 皇帝/奴隷カードがある場合、それぞれ30%の確率で使用
-        elif (emperor_count > 0 or slave_count > 0) and random.random() < 0.3:
-            for i, card in enumerate(self.hand):
-                if card.card_type in [CardType.EMPEROR, CardType.SLAVE]:
-                    available_indices.append(i)
+        elif (emperor_count > 0 or slave_count > 0) and self.rng.random() < 0.3:
+            available_indices = self.hand.indices_of(CardType.EMPEROR, CardType.SLAVE)
         
         # 上記の条件に当てはまらない場合や、available_indicesが空の場合
         if not available_indices:
             available_indices = list(range(len(self.hand)))
         
         # 選択可能なカードからランダムに1枚を選択
-        selected_index = random.choice(available_indices)
-        return self.select_card(selected_index)
\ No newline at end of file
+        return self.rng.choice(available_indices)
+
+class RandomAIPlayer(AIPlayer):
+    """手札から完全にランダムに選ぶ CPU（比較用のベースライン）"""
+
+    def choose_card_index(self) -> int:
+        return self.rng.randrange(len(self.hand))
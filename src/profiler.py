@@ -0,0 +1,113 @@
+"""フレーム時間のプロファイラー（オプトイン）
+
+有効にしたときだけ、計測したいメソッドをインスタンス上で時間計測付きの関数に差し替える。
+無効なら元のメソッドがそのまま呼ばれるので、Game 側のコストは
+「self.profiler is not None」の確認1回だけになる。
+
+計測値はフェーズ（メソッド）ごとの固定長のリングバッファに1フレーム分ずつ積算し、
+画面の隅に直近のフレーム時間のグラフと p50/p99 を描き、終了時に CSV に書き出す。
+"""
+
+import csv
+import time
+from array import array
+from typing import Dict, Iterable, List
+
+DEFAULT_CAPACITY = 240  # 保持するフレーム数（60fps で4秒分）
+GRAPH_WIDTH = 80
+GRAPH_HEIGHT = 24
+GRAPH_MAX_MS = 33.3  # グラフの上端（30fps 相当）
+BUDGET_MS = 1000 / 60  # 60fps の1フレームの予算
+
+class FrameProfiler:
+    """フェーズごとの1フレームあたりの処理時間のリングバッファ"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, frame_phases: Iterable[str] = ("update", "draw")):
+        self.capacity = capacity
+        self.frame_phases = tuple(frame_phases)  # フレーム全体の時間として合計するフェーズ
+        self.phases: Dict[str, array] = {}
+        self.frame = 0  # 記録中のフレームの番号
+        self.clock = time.perf_counter
+
+    def _buffer(self, phase: str) -> array:
+        buffer = self.phases.get(phase)
+        if buffer is None:
+            buffer = array("d", bytes(8 * self.capacity))
+            self.phases[phase] = buffer
+        return buffer
+
+    def next_frame(self):
+        """新しいフレームの記録を始める（古いフレームの値を上書きする）"""
+        self.frame += 1
+        slot = self.frame % self.capacity
+        for buffer in self.phases.values():
+            buffer[slot] = 0.0
+
+    def record(self, phase: str, seconds: float):
+        self._buffer(phase)[self.frame % self.capacity] += seconds
+
+    def wrap(self, phase: str, func, starts_frame: bool = False):
+        """func を時間計測付きの関数で包む（starts_frame なら呼ぶたびに新しいフレーム）"""
+        buffer = self._buffer(phase)
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            if starts_frame:
+                self.next_frame()
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # CPU の思考などワーカースレッドで終わった分は、終わった時点のフレームに積む
+                buffer[self.frame % self.capacity] += clock() - start
+        timed.__wrapped__ = func
+        return timed
+
+    def instrument(self, obj, names: Iterable[str], prefix: str = "", frame_method: str = None):
+        """obj のメソッド names をインスタンス上で計測付きに差し替える"""
+        for name in names:
+            method = getattr(obj, name)
+            if hasattr(method, "__wrapped__"):
+                continue  # 計測済み
+            setattr(obj, name, self.wrap(prefix + name, method, starts_frame=name == frame_method))
+
+    def frame_times(self) -> List[float]:
+        """直近のフレーム（記録中のものを除く）の処理時間（ミリ秒、古い順）"""
+        count = min(self.frame - 1, self.capacity - 1)
+        buffers = [self.phases[phase] for phase in self.frame_phases if phase in self.phases]
+        times = []
+        for frame in range(self.frame - count, self.frame):
+            slot = frame % self.capacity
+            times.append(sum(buffer[slot] for buffer in buffers) * 1000)
+        return times
+
+    @staticmethod
+    def percentile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def draw(self, gfx, x: int, y: int):
+        """直近のフレーム時間の棒グラフと p50/p99 を描く"""
+        times = self.frame_times()[-GRAPH_WIDTH:]
+        gfx.rect(x, y, GRAPH_WIDTH, GRAPH_HEIGHT + 8, 0)
+        budget_y = y + 8 + GRAPH_HEIGHT - int(GRAPH_HEIGHT * BUDGET_MS / GRAPH_MAX_MS)
+        gfx.line(x, budget_y, x + GRAPH_WIDTH - 1, budget_y, 5)  # 60fps の予算
+        for i, ms in enumerate(times):
+            h = min(GRAPH_HEIGHT, max(1, int(GRAPH_HEIGHT * ms / GRAPH_MAX_MS)))
+            gfx.line(x + i, y + 8 + GRAPH_HEIGHT - h, x + i, y + 7 + GRAPH_HEIGHT,
+                     11 if ms <= BUDGET_MS else 8)
+        label = f"P50 {self.percentile(times, 0.5):.1f} P99 {self.percentile(times, 0.99):.1f}"
+        gfx.text(x + 1, y + 1, label, 7)
+
+    def save_csv(self, path: str):
+        """保持しているフレームのフェーズごとの時間（ミリ秒）を CSV に書き出す"""
+        phases = sorted(self.phases)
+        count = min(self.frame, self.capacity)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + phases)
+            for frame in range(self.frame - count + 1, self.frame + 1):
+                slot = frame % self.capacity
+                writer.writerow([frame] + [f"{self.phases[phase][slot] * 1000:.4f}" for phase in phases])
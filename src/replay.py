@@ -0,0 +1,53 @@
+"""記録した試合（match_log.MatchRecord）の再生
+
+ヘッドレスでの高速な再シミュレーションと、コマンドラインからの一括再生・検証を行う。
+画面に描画しながらの再生は Game.start_replay（python src/main.py --replay FILE）を使う。
+"""
+
+import argparse
+import time
+from engine import MatchEngine
+from match_log import MatchRecord
+from player import Player, AIPlayer, PlayerType
+
+def replay_match(record: MatchRecord) -> MatchEngine:
+    """ログを元に試合をヘッドレスで再現する
+
+    CPU の思考は行わず、記録された位置のカードをそのまま出す。
+    途中で終わった試合のログはそのターンまでを再現する。
+    """
+    engine = MatchEngine(record.total_battles, record.seed)
+    engine.start(Player("Player 1", PlayerType.HUMAN), AIPlayer("CPU"), deals=record.deals)
+    last = len(record.moves) - 1
+    for i, (card_index, ai_card_index) in enumerate(record.moves):
+        if engine.finished:
+            raise ValueError("match record has moves after the end of the match")
+        if engine.play_card(card_index, ai_card_index) is None:
+            raise ValueError(f"invalid move at turn {i + 1}: {card_index}, {ai_card_index}")
+        # 決着したら次の戦へ（途中で終わったログは次の配布が記録されていないので進めない）
+        if engine.battle_result is not None:
+            if i < last or engine.current_battle == engine.total_battles:
+                engine.next_battle()
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description="記録した試合をヘッドレスで再生する")
+    parser.add_argument("records", nargs="+", help="試合の記録ファイル (*.ecr)")
+    parser.add_argument("-r", "--repeat", type=int, default=1,
+                        help="再生を繰り返す回数（速度の計測用）")
+    args = parser.parse_args()
+
+    records = [(path, MatchRecord.load(path)) for path in args.records]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        engines = [(path, replay_match(record)) for path, record in records]
+    elapsed = time.perf_counter() - start
+
+    for path, engine in engines:
+        status = "finished" if engine.finished else f"battle {engine.current_battle} turn {engine.round}"
+        print(f"{path}: YOU {engine.player.score} - {engine.ai_player.score} CPU ({status})")
+    count = len(records) * args.repeat
+    print(f"replayed {count} matches in {elapsed:.3f}s ({count / elapsed:,.0f} matches/s)")
+
+if __name__ == "__main__":
+    main()
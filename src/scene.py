@@ -0,0 +1,67 @@
+"""描き直しを変化した範囲に限る保持型の描画レイヤー
+
+pyxel の画面は前のフレームの内容を保持しているので、毎フレーム cls して全体を描き直す必要はない。
+画面の各範囲に「その範囲の見た目を決める状態」を返す関数を登録しておき、
+値が変わった範囲だけを clip して描き直す。何も変わっていないフレームは描画を丸ごと省く。
+"""
+
+from typing import Callable, Hashable, List, Tuple
+
+Rect = Tuple[int, int, int, int]  # (x, y, 幅, 高さ)
+
+class RetainedScene:
+    """状態の変化から再描画が必要な範囲を求めて、その範囲だけを描き直す"""
+
+    def __init__(self, width: int, height: int, enabled: bool = True):
+        self.width = width
+        self.height = height
+        self.enabled = enabled  # False なら従来通り毎フレーム全体を描き直す
+        self.scene_key: Callable[[], Hashable] = lambda: None
+        self.regions: List[Tuple[Rect, Callable[[], Hashable]]] = []
+        self._last_scene = None
+        self._last_keys: List[Hashable] = []
+        self._invalid = True
+        self.repainted: List[Rect] = []  # 直前のフレームで描き直した範囲（統計用）
+
+    def set_scene_key(self, key: Callable[[], Hashable]):
+        """画面全体の描き直しが必要になる状態（画面の切り替え、ポップアップなど）"""
+        self.scene_key = key
+        self.invalidate()
+
+    def add_region(self, rect: Rect, key: Callable[[], Hashable]):
+        """rect の見た目を決める状態を返す関数を登録する"""
+        self.regions.append((rect, key))
+        self.invalidate()
+
+    def invalidate(self):
+        """次のフレームで画面全体を描き直す"""
+        self._invalid = True
+
+    def dirty_rects(self) -> List[Rect]:
+        """前回の描画から見た目が変わった範囲（画面全体なら1つの全画面の範囲）"""
+        scene = self.scene_key()
+        keys = [key() for _, key in self.regions]
+        full = self._invalid or not self.enabled or scene != self._last_scene
+        dirty = [] if full else [rect for (rect, _), old, new in zip(self.regions, self._last_keys, keys)
+                                 if old != new]
+        self._last_scene = scene
+        self._last_keys = keys
+        self._invalid = False
+        return [(0, 0, self.width, self.height)] if full else dirty
+
+    def render(self, gfx, draw: Callable[[], None], bg: int = 0) -> bool:
+        """変化した範囲だけ draw で描き直す（何も描かなかったフレームは False）
+
+        draw は画面全体を描く関数のままでよい。部分的な描き直しでは clip で範囲外への描画が捨てられる。
+        """
+        self.repainted = self.dirty_rects()
+        for x, y, w, h in self.repainted:
+            if (x, y, w, h) == (0, 0, self.width, self.height):
+                gfx.cls(bg)
+                draw()
+                continue
+            gfx.clip(x, y, w, h)
+            gfx.rect(x, y, w, h, bg)  # cls は clip を無視するので rect で消す
+            draw()
+            gfx.clip()
+        return bool(self.repainted)
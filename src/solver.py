@@ -0,0 +1,106 @@
+"""E Card の1バトルを厳密に解くソルバー
+
+バトルの状態は (皇帝側の市民の枚数, 奴隷側の市民の枚数) だけで決まる。
+皇帝/奴隷を出した時点で決着するため、未決着の状態では両者とも特殊カードを必ず持っている。
+初期状態から到達できる全状態を一度だけ列挙し、各状態の混合戦略の均衡と
+ゲームの値（皇帝側から見た 勝ち=+1 / 負け=-1 の期待値）を表にしてメモ化する。
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from card import CardType, judge, DRAW
+from player import AIPlayer
+
+CITIZENS = 4  # 初期の市民の枚数
+
+State = Tuple[int, int]  # (皇帝側の市民の枚数, 奴隷側の市民の枚数)
+
+class Equilibrium:
+    """1状態の均衡（特殊カードを出す確率と状態の値）"""
+
+    def __init__(self, value: Fraction, emperor_special: Fraction, slave_special: Fraction):
+        self.value = value  # 皇帝側から見た期待値
+        self.emperor_special = emperor_special  # 皇帝側が皇帝を出す確率
+        self.slave_special = slave_special  # 奴隷側が奴隷を出す確率
+
+    def __repr__(self) -> str:
+        return (f"Equilibrium(value={self.value}, emperor_special={self.emperor_special}, "
+                f"slave_special={self.slave_special})")
+
+def solve_matrix_game(payoff: List[List[Fraction]]) -> Tuple[Fraction, List[Fraction], List[Fraction]]:
+    """高々 2x2 のゼロサムゲームを解く（行プレイヤーが最大化）
+
+    Returns:
+        (ゲームの値, 行プレイヤーの混合戦略, 列プレイヤーの混合戦略)
+    """
+    rows = len(payoff)
+    cols = len(payoff[0])
+
+    # 純粋戦略の鞍点があればそれが均衡
+    for i in range(rows):
+        for j in range(cols):
+            cell = payoff[i][j]
+            if cell == min(payoff[i]) and cell == max(payoff[k][j] for k in range(rows)):
+                row_strategy = [Fraction(int(k == i)) for k in range(rows)]
+                col_strategy = [Fraction(int(k == j)) for k in range(cols)]
+                return cell, row_strategy, col_strategy
+
+    # 鞍点のない 2x2 は両者を無差別にする混合戦略が均衡
+    (a, b), (c, d) = payoff
+    denominator = a - b - c + d
+    p = (d - c) / denominator
+    q = (d - b) / denominator
+    value = (a * d - b * c) / denominator
+    return value, [p, 1 - p], [q, 1 - q]
+
+def _payoff(state: State, emperor_card: CardType, slave_card: CardType, table: Dict[State, Equilibrium]) -> Fraction:
+    outcome = judge(emperor_card, slave_card)
+    if outcome != DRAW:
+        return Fraction(outcome)
+    # 市民同士は引き分けで次のターンへ
+    return table[(state[0] - 1, state[1] - 1)].value
+
+def _actions(citizens: int, special: CardType) -> List[CardType]:
+    return [special, CardType.CITIZEN] if citizens > 0 else [special]
+
+@lru_cache(maxsize=None)
+def equilibrium_table(citizens: int = CITIZENS) -> Dict[State, Equilibrium]:
+    """到達可能な全状態の均衡表（初回呼び出し時に一度だけ計算する）"""
+    # 初期状態から到達できる状態を列挙（市民同士の引き分けのみが次の状態へ進む）
+    reachable = []
+    state = (citizens, citizens)
+    while state[0] >= 0 and state[1] >= 0:
+        reachable.append(state)
+        state = (state[0] - 1, state[1] - 1)
+
+    # 終盤の状態から順に解く
+    table: Dict[State, Equilibrium] = {}
+    for state in reversed(reachable):
+        emperor_actions = _actions(state[0], CardType.EMPEROR)
+        slave_actions = _actions(state[1], CardType.SLAVE)
+        payoff = [[_payoff(state, e, s, table) for s in slave_actions] for e in emperor_actions]
+        value, emperor_strategy, slave_strategy = solve_matrix_game(payoff)
+        table[state] = Equilibrium(value, emperor_strategy[0], slave_strategy[0])
+    return table
+
+@lru_cache(maxsize=None)
+def special_probability_table(citizens: int = CITIZENS) -> Dict[Tuple[CardType, int], float]:
+    """(持っている特殊カード, 手札の枚数) -> 特殊カードを出す確率 の表"""
+    table = {}
+    for (emperor_citizens, slave_citizens), equilibrium in equilibrium_table(citizens).items():
+        table[(CardType.EMPEROR, emperor_citizens + 1)] = float(equilibrium.emperor_special)
+        table[(CardType.SLAVE, slave_citizens + 1)] = float(equilibrium.slave_special)
+    return table
+
+class SolverAIPlayer(AIPlayer):
+    """均衡表を引いて最適な混合戦略で出すカードを選ぶ CPU"""
+
+    def choose_card_index(self) -> int:
+        # 未決着のバトルでは特殊カードは必ず手札にあり、残りは全て市民
+        special = CardType.EMPEROR if self.hand.count(CardType.EMPEROR) else CardType.SLAVE
+        probability = special_probability_table()[(special, len(self.hand))]
+
+        if self.rng.random() < probability:
+            return self.hand.index(special)
+        return self.hand.index(CardType.CITIZEN)
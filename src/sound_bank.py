@@ -0,0 +1,121 @@
+"""事前に変換したサウンドバンクの読み込み
+
+効果音・BGM の元データ（assets/sounds.json、pyxel の音符・音色などの文字列）は
+このモジュールをスクリプトとして実行して、pyxel が内部で使う数値の列に変換したバンク
+（assets/sounds.bank.json）にしておく。ゲームはバンクを最初に音を鳴らすときに読み込み、
+各サウンドも初めて鳴らすときに pyxel.sounds に設定する（起動時には音の文字列を解析しない）。
+
+    python src/sound_bank.py  # assets/sounds.json から assets/sounds.bank.json を作る
+"""
+
+import argparse
+import json
+import os
+import pyxel
+from typing import Dict, List, Optional
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+DEFAULT_SOURCE = os.path.join(ASSETS_DIR, "sounds.json")
+DEFAULT_BANK = os.path.join(ASSETS_DIR, "sounds.bank.json")
+BANK_VERSION = 1
+
+class SoundBank:
+    """バンクのサウンド・音楽を、初めて鳴らすときに pyxel に設定する"""
+
+    def __init__(self, path: str = DEFAULT_BANK):
+        self.path = path
+        self._sounds: Optional[Dict[str, dict]] = None
+        self._musics: Optional[Dict[str, dict]] = None
+        self.loaded_sounds = set()
+        self.loaded_musics = set()
+
+    def _load_bank(self):
+        if self._sounds is not None:
+            return
+        with open(self.path, encoding="utf-8") as f:
+            bank = json.load(f)
+        if bank.get("version") != BANK_VERSION:
+            raise ValueError(f"unsupported sound bank version: {bank.get('version')}")
+        self._sounds = bank["sounds"]
+        self._musics = bank["musics"]
+
+    def load_sound(self, snd: int):
+        """サウンド snd を pyxel.sounds に設定する（設定済みなら何もしない）"""
+        if snd in self.loaded_sounds:
+            return
+        self._load_bank()
+        data = self._sounds[str(snd)]
+        sound = pyxel.sounds[snd]
+        sound.notes[:] = data["notes"]
+        sound.tones[:] = data["tones"]
+        sound.volumes[:] = data["volumes"]
+        sound.effects[:] = data["effects"]
+        sound.speed = data["speed"]
+        self.loaded_sounds.add(snd)
+
+    def load_music(self, msc: int):
+        """音楽 msc とそれが使うサウンドを pyxel に設定する"""
+        if msc in self.loaded_musics:
+            return
+        self._load_bank()
+        self.loaded_musics.add(msc)
+        music = self._musics.get(str(msc))
+        if music is None:
+            return  # バンクに無い音楽は pyxel.musics の内容のまま（未設定なら鳴らない）
+        seqs = music["seqs"]
+        for seq in seqs:
+            for snd in seq:
+                self.load_sound(snd)
+        pyxel.musics[msc].set(*seqs)
+
+    def play(self, ch: int, snd: int, **kwargs):
+        self.load_sound(snd)
+        pyxel.play(ch, snd, **kwargs)
+
+    def playm(self, msc: int, **kwargs):
+        self.load_music(msc)
+        pyxel.playm(msc, **kwargs)
+
+def bake_sound(data: dict) -> dict:
+    """音符などの文字列を pyxel で解析して数値の列にする"""
+    sound = pyxel.Sound()
+    sound.set(data["notes"], data["tones"], data["volumes"], data["effects"], data["speed"])
+    return {
+        "name": data.get("name", ""),
+        "notes": list(sound.notes),
+        "tones": list(sound.tones),
+        "volumes": list(sound.volumes),
+        "effects": list(sound.effects),
+        "speed": sound.speed,
+    }
+
+def build_bank(source: str = DEFAULT_SOURCE, output: str = DEFAULT_BANK):
+    """元データ source を変換したバンクを output に書き出す"""
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    sounds = {key: bake_sound(sound) for key, sound in data["sounds"].items()}
+    musics: Dict[str, dict] = {}
+    for key, music in data.get("musics", {}).items():
+        seqs: List[List[int]] = music["seqs"]
+        for seq in seqs:
+            for snd in seq:
+                if str(snd) not in sounds:
+                    raise ValueError(f"music {key} uses undefined sound {snd}")
+        musics[key] = {"name": music.get("name", ""), "seqs": seqs}
+    bank = {"version": BANK_VERSION, "sounds": sounds, "musics": musics}
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(bank, f, separators=(",", ":"))
+        f.write("\n")
+    os.replace(tmp_path, output)
+
+def main():
+    parser = argparse.ArgumentParser(description="サウンドの元データからサウンドバンクを作る")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="元データ (JSON)")
+    parser.add_argument("-o", "--output", default=DEFAULT_BANK, help="書き出すバンク")
+    args = parser.parse_args()
+    build_bank(args.source, args.output)
+    print(f"wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""カードのスプライトアトラスと描画呼び出しのカウンター
+
+カードの表面・裏面を使うサイズごとに起動時に一度だけイメージバンクへ描いておき、
+毎フレームは1枚につき blt 1回で描画する。
+（プリミティブで描くと表面は rect/rectb/text で5回以上、裏面は格子模様で約60回の呼び出しになる）
+"""
+
+import pyxel
+from card import CardType
+
+ATLAS_BANK = 0  # アトラスに使うイメージバンク
+
+# 画面で使うカードの大きさ（幅, 高さ）
+HAND_CARD_SIZE = (28, 38)     # draw_hand / draw_cpu_hand
+PLAYED_CARD_SIZE = (25, 35)   # draw_played_cards
+HISTORY_CARD_SIZE = (20, 28)  # draw_cards_history
+CARD_SIZES = (HAND_CARD_SIZE, PLAYED_CARD_SIZE, HISTORY_CARD_SIZE)
+
+CARD_BACK = None  # 裏面を表すキー（カードの種類の代わり）
+
+_CARD_COLORS = {CardType.EMPEROR: 9, CardType.CITIZEN: 5, CardType.SLAVE: 8}
+_CARD_LABELS = {CardType.EMPEROR: "EMP", CardType.CITIZEN: "CIT", CardType.SLAVE: "SLV"}
+_CARD_INITIALS = {CardType.EMPEROR: "E", CardType.CITIZEN: "C", CardType.SLAVE: "S"}
+
+def draw_card_face(target, card_type: CardType, x: int, y: int, width: int, height: int):
+    """カードの表面をプリミティブで描く（target は pyxel か pyxel.Image）"""
+    # カードの背景と枠（皇帝は青、市民は灰色、奴隷は赤）
+    target.rect(x, y, width, height, _CARD_COLORS[card_type])
+    target.rectb(x, y, width, height, 7)
+
+    # カードの種類のテキスト（短縮版の英語表記）を中央に配置
+    label = _CARD_LABELS[card_type]
+    text_width = len(label) * 4  # 英語フォントは1文字4ピクセル
+    target.text(x + (width - text_width) // 2, y + (height - 5) // 2, label, 0)
+
+    # 左上と右下にカードの種類の頭文字
+    initial = _CARD_INITIALS[card_type]
+    target.text(x + 5, y + 5, initial, 0)
+    target.text(x + width - 9, y + height - 10, initial, 0)
+
+def draw_card_back_face(target, x: int, y: int, width: int, height: int):
+    """カードの裏面をプリミティブで描く（target は pyxel か pyxel.Image）"""
+    target.rect(x, y, width, height, 13)  # 背景色
+    target.rectb(x, y, width, height, 7)  # 枠線
+
+    # 裏面のパターン（シンプルな格子模様）
+    for i in range(2, width - 2, 4):
+        for j in range(2, height - 2, 4):
+            target.rect(x + i, y + j, 2, 2, 6)
+
+class CardAtlas:
+    """(カードの種類, 大きさ) ごとのスプライトをイメージバンクに並べたもの"""
+
+    def __init__(self, bank: int = ATLAS_BANK, sizes=CARD_SIZES):
+        self.bank = bank
+        self.image = pyxel.images[bank]
+        self.sprites = {}  # (カードの種類 or CARD_BACK, 幅, 高さ) -> (u, v)
+
+        # 大きさごとに1行、表面3種類と裏面を横に並べる
+        v = 0
+        for width, height in sizes:
+            u = 0
+            for card_type in (CardType.EMPEROR, CardType.CITIZEN, CardType.SLAVE, CARD_BACK):
+                if u + width > self.image.width or v + height > self.image.height:
+                    raise ValueError("card sprites do not fit in the image bank")
+                if card_type is CARD_BACK:
+                    draw_card_back_face(self.image, u, v, width, height)
+                else:
+                    draw_card_face(self.image, card_type, u, v, width, height)
+                self.sprites[(card_type, width, height)] = (u, v)
+                u += width
+            v += height
+
+    def draw(self, target, card_type, x: int, y: int, width: int, height: int) -> bool:
+        """スプライトがあれば blt 1回で描いて True を返す（無い大きさなら False）"""
+        sprite = self.sprites.get((card_type, width, height))
+        if sprite is None:
+            return False
+        target.blt(x, y, self.bank, sprite[0], sprite[1], width, height)
+        return True
+
+class DrawCallCounter:
+    """pyxel の描画関数の呼び出し回数を数えるラッパー
+
+    Game.gfx をこれに差し替えると、1フレームに発行した描画呼び出しの数が
+    last_frame に残る（描画以外の属性はそのまま pyxel に委譲する）。
+    """
+
+    DRAW_CALLS = ("cls", "pset", "line", "rect", "rectb", "circ", "circb", "elli", "ellib",
+                  "tri", "trib", "fill", "blt", "bltm", "text")
+
+    def __init__(self, target=pyxel):
+        self.target = target
+        self.count = 0
+        self.last_frame = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.target, name)
+        if name in self.DRAW_CALLS:
+            def counted(*args, **kwargs):
+                self.count += 1
+                return attr(*args, **kwargs)
+            # 2回目以降は __getattr__ を通らないようにキャッシュする
+            setattr(self, name, counted)
+            return counted
+        return attr
+
+    def end_frame(self):
+        self.last_frame = self.count
+        self.count = 0
@@ -0,0 +1,114 @@
+"""起動時間のトレーサー
+
+モジュールごとの import にかかった時間（そのモジュール自身の分と、中で import したものを含む分）と、
+初期化の各段階（フェーズ）の時間を記録して、最初のフレームを描くまでの内訳を表示する。
+python src/main.py --trace-startup で有効になる（無効なときは import フックを入れない）。
+"""
+
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+class _TimedLoader(importlib.abc.Loader):
+    """元のローダーの exec_module（モジュール本体の実行）の時間を計る"""
+
+    def __init__(self, tracer: "StartupTracer", loader):
+        self.tracer = tracer
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        tracer = self.tracer
+        tracer._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            nested = tracer._stack.pop()
+            if tracer._stack:
+                tracer._stack[-1] += total
+            tracer.imports.append((module.__name__, total - nested, total))
+
+    def __getattr__(self, name):
+        # get_resource_reader などはそのまま元のローダーに任せる
+        return getattr(self.loader, name)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """他のファインダーが見つけたモジュールのローダーを _TimedLoader で包む"""
+
+    def __init__(self, tracer: "StartupTracer"):
+        self.tracer = tracer
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(self.tracer, spec.loader)
+                return spec
+        return None
+
+class StartupTracer:
+    """import と初期化のフェーズごとの時間の記録"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.imports: List[Tuple[str, float, float]] = []  # (モジュール名, 自身の時間, 合計時間)
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame: Optional[float] = None  # origin から最初のフレームを描き終えるまで（秒）
+        self._stack: List[float] = []
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self):
+        """これ以降の import の時間を記録する"""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def watch_first_frame(self, game, on_first_frame=None):
+        """game の最初の draw が終わった時刻を記録する
+
+        pyxel.run に渡す前に game.draw を差し替える（2フレーム目以降は元の draw を呼ぶだけ）。
+        """
+        draw = game.draw
+
+        def first_draw():
+            draw()
+            if self.first_frame is None:
+                self.first_frame = time.perf_counter() - self.origin
+                if on_first_frame is not None:
+                    on_first_frame()
+        game.draw = first_draw
+
+    def report(self, file=None, limit: int = 15):
+        file = file or sys.stderr
+        print("startup trace (ms)", file=file)
+        print(f"  {'module':32} {'self':>8} {'cumulative':>11}", file=file)
+        for name, own, total in sorted(self.imports, key=lambda item: item[1], reverse=True)[:limit]:
+            print(f"  {name:32} {own * 1000:8.2f} {total * 1000:11.2f}", file=file)
+        own_total = sum(own for _, own, _ in self.imports)
+        print(f"  {len(self.imports)} modules, {own_total * 1000:.2f} ms in imports", file=file)
+        for name, seconds in self.phases:
+            print(f"  phase {name:26} {seconds * 1000:8.2f}", file=file)
+        if self.first_frame is not None:
+            print(f"  time to first frame {self.first_frame * 1000:.2f} ms", file=file)
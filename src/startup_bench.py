@@ -0,0 +1,64 @@
+"""起動から最初のフレームまでの時間（time to first frame）のベンチマーク
+
+main.py を --exit-after-first-frame 付きで別プロセスとして繰り返し起動し、
+プロセスの起動から最初のフレームを描き終えるまでの時間を計る。
+--output を指定するとコミットごとの結果を JSON Lines で追記するので、コミットごとに実行して比較できる。
+
+    python src/startup_bench.py -n 10 --output startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(SRC_DIR, "main.py")
+
+def run_once(extra_args=()) -> dict:
+    """main.py を1回起動して、時間（ミリ秒）を返す"""
+    env = dict(os.environ)
+    # ウィンドウを出さずに計測できるようにする（指定済みならそれを使う）
+    env.setdefault("SDL_VIDEODRIVER", "offscreen")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, MAIN, "--exit-after-first-frame", *extra_args],
+                            env=env, capture_output=True, text=True, timeout=60)
+    wall = (time.perf_counter() - start) * 1000
+    for line in result.stdout.splitlines():
+        if line.startswith("first_frame_ms="):
+            return {"wall_ms": wall, "first_frame_ms": float(line.split("=", 1)[1])}
+    raise RuntimeError(f"main.py did not report the first frame:\n{result.stderr}")
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description="起動から最初のフレームまでの時間を計る")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="起動する回数")
+    parser.add_argument("--output", help="結果を JSON Lines で追記するファイル")
+    parser.add_argument("main_args", nargs="*", help="main.py に渡す引数（-- の後に書く）")
+    args = parser.parse_args()
+
+    run_once(args.main_args)  # 1回目は .pyc の作成などが入るので捨てる
+    runs = [run_once(args.main_args) for _ in range(args.runs)]
+    summary = {"revision": git_revision(), "runs": args.runs}
+    for key in ("wall_ms", "first_frame_ms"):
+        values = [run[key] for run in runs]
+        summary[key] = {"min": round(min(values), 2), "median": round(statistics.median(values), 2),
+                        "max": round(max(values), 2)}
+        print(f"{key:15} min {min(values):8.2f}  median {statistics.median(values):8.2f}"
+              f"  max {max(values):8.2f}")
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+
+if __name__ == "__main__":
+    main()
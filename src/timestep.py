@@ -0,0 +1,66 @@
+"""固定タイムステップのループ制御
+
+ゲームの状態は決まった間隔（tick）で進め、描画はその結果を表示するだけにする。
+経過時間を貯めておき、溜まった分だけ tick を進める（描画が遅れても状態と入力の処理は遅れない）。
+描画が画面の1フレームの時間を超えたときは次のフレームの描画を飛ばす。
+time_scale を上げると実時間より速く状態を進められる（デモや自動テスト用）。
+"""
+
+import time
+
+TICK_RATE = 30  # 1秒あたりの tick 数（pyxel の既定の fps と同じ）
+FRAME_RATE = 30  # 画面の1秒あたりのフレーム数（pyxel.init の既定の fps）
+MAX_TICKS_PER_FRAME = 120  # 1フレームで進める tick の上限（これを超えた遅れは捨てる）
+MAX_FRAME_SKIP = 4  # 連続して描画を飛ばすフレーム数の上限
+
+class FixedTimestep:
+    """経過時間から、そのフレームで進める tick の数と描画するかどうかを決める"""
+
+    def __init__(self, tick_rate: int = TICK_RATE, time_scale: float = 1.0,
+                 max_ticks_per_frame: int = MAX_TICKS_PER_FRAME, clock=time.perf_counter,
+                 frame_rate: int = FRAME_RATE):
+        self.tick = 1.0 / tick_rate
+        self.frame = 1.0 / frame_rate  # 描画の予算（time_scale に関係なく画面の1フレーム）
+        self.time_scale = time_scale
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = None
+        self.ticks = 0  # これまでに進めた tick の数
+        self.last_draw_time = 0.0  # 直前の描画にかかった時間（秒）
+        self.skipped_frames = 0  # 連続して描画を飛ばしたフレーム数
+
+    def advance(self) -> int:
+        """前のフレームからの経過時間（time_scale 倍）に相当する tick の数"""
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            self.ticks += 1
+            return 1
+        self.accumulator += (now - self.last_time) * self.time_scale
+        self.last_time = now
+        ticks = int(self.accumulator / self.tick)
+        self.accumulator -= ticks * self.tick
+        if ticks > self.max_ticks_per_frame:
+            # 追いつけない遅れは捨てる（止まっていた後に一気に進みすぎないように）
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """次の tick までの進み具合（0〜1、描画で tick の間を補間するときに使う）"""
+        return self.accumulator / self.tick
+
+    def should_draw(self) -> bool:
+        """前の描画が画面の1フレームの予算を超えていたら、このフレームの描画を飛ばす"""
+        if self.last_draw_time > self.frame and self.skipped_frames < MAX_FRAME_SKIP:
+            self.skipped_frames += 1
+            self.last_draw_time -= self.frame  # 飛ばした分だけ遅れを返したことにする
+            return False
+        self.skipped_frames = 0
+        return True
+
+    def draw_finished(self, seconds: float):
+        self.last_draw_time = seconds
@@ -0,0 +1,169 @@
+import argparse
+import itertools
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Type
+from player import AIPlayer, RandomAIPlayer
+from engine import simulate_match
+from solver import SolverAIPlayer
+from mcts import FixedIterationMCTSPlayer
+
+# 総当たり戦に参加できる CPU の戦略（名前 -> AIPlayer のサブクラス）
+STRATEGIES: Dict[str, Type[AIPlayer]] = {
+    "basic": AIPlayer,
+    "random": RandomAIPlayer,
+    "solver": SolverAIPlayer,
+    "mcts": FixedIterationMCTSPlayer,
+}
+
+SHARD_SIZE = 500  # 1 ワーカータスクあたりの試合数
+ELO_INITIAL = 1500.0  # 平均的な強さの戦略のレーティング
+RATING_ITERATIONS = 1000  # Bradley–Terry の当てはめの反復の上限
+RATING_TOLERANCE = 1e-9
+
+# (shard_id, match_index, strategy_a, strategy_b, score_a, score_b)
+MatchResult = Tuple[int, int, str, str, int, int]
+
+def register_strategy(name: str, strategy_cls: Type[AIPlayer]):
+    """戦略を登録する（ワーカーからも参照できるようモジュールの import 時に呼ぶこと）"""
+    STRATEGIES[name] = strategy_cls
+
+def shard_seed(seed: int, strategy_a: str, strategy_b: str, shard_index: int) -> int:
+    """シャードごとの決定的な seed（プロセスやハッシュのランダム化に依存しない）"""
+    return random.Random(f"{seed}:{strategy_a}:{strategy_b}:{shard_index}").getrandbits(64)
+
+def play_shard(shard_id: int, strategy_a: str, strategy_b: str, seed: int,
+               matches: int) -> List[MatchResult]:
+    """1シャード分の試合を実行し、結果をまとめて返す（親プロセスとのやり取りはシャードごとに1回）"""
+    rng = random.Random(seed)  # ワーカーごとの乱数生成器
+    cls_a = STRATEGIES[strategy_a]
+    cls_b = STRATEGIES[strategy_b]
+    shard_results = []
+    for match_index in range(matches):
+        # 先手（最初に皇帝側）を交互に入れ替える
+        a_first = match_index % 2 == 0
+        engine = simulate_match(rng.getrandbits(64),
+                                cls_a if a_first else cls_b,
+                                cls_b if a_first else cls_a)
+        first, second = engine.player.score, engine.ai_player.score
+        score_a, score_b = (first, second) if a_first else (second, first)
+        shard_results.append((shard_id, match_index, strategy_a, strategy_b, score_a, score_b))
+    return shard_results
+
+class StandingsTable:
+    """勝敗表と Elo レーティング"""
+
+    def __init__(self, strategies: List[str]):
+        self.strategies = list(strategies)
+        self.wins = {name: 0 for name in self.strategies}
+        self.draws = {name: 0 for name in self.strategies}
+        self.losses = {name: 0 for name in self.strategies}
+        self.results: List[MatchResult] = []
+
+    def record(self, result: MatchResult):
+        _, _, strategy_a, strategy_b, score_a, score_b = result
+        self.results.append(result)
+        if score_a > score_b:
+            self.wins[strategy_a] += 1
+            self.losses[strategy_b] += 1
+        elif score_a < score_b:
+            self.losses[strategy_a] += 1
+            self.wins[strategy_b] += 1
+        else:
+            self.draws[strategy_a] += 1
+            self.draws[strategy_b] += 1
+
+    def games(self, name: str) -> int:
+        return self.wins[name] + self.draws[name] + self.losses[name]
+
+    def win_rate(self, name: str) -> float:
+        """引き分けを 0.5 勝として数えた勝率"""
+        games = self.games(name)
+        return (self.wins[name] + 0.5 * self.draws[name]) / games if games else 0.0
+
+    def elo(self) -> Dict[str, float]:
+        """全試合の勝敗から一度に当てはめた Bradley–Terry モデルのレーティング（Elo と同じ尺度）
+
+        1試合ずつ更新する Elo は試合の順序で値が変わり、勝率の順位と食い違うことがあるため、
+        組ごとの勝ち数（引き分けは 0.5 勝）だけから強さを求める（MM 法）。
+        全勝・全敗でも有限の値になるよう、対戦した組には引き分けを1試合ずつ加えておく。
+        """
+        names = self.strategies
+        wins = {(a, b): 0.0 for a in names for b in names if a != b}  # a が b から挙げた勝ち数
+        games = dict.fromkeys(wins, 0)
+        for _, _, strategy_a, strategy_b, score_a, score_b in self.results:
+            actual_a = 1.0 if score_a > score_b else 0.0 if score_a < score_b else 0.5
+            wins[strategy_a, strategy_b] += actual_a
+            wins[strategy_b, strategy_a] += 1.0 - actual_a
+            games[strategy_a, strategy_b] += 1
+            games[strategy_b, strategy_a] += 1
+        for pair, count in games.items():
+            if count:
+                wins[pair] += 0.5
+                games[pair] = count + 1
+
+        strength = dict.fromkeys(names, 1.0)
+        for _ in range(RATING_ITERATIONS):
+            updated = {}
+            for a in names:
+                total = sum(wins[a, b] for b in names if b != a)
+                weight = sum(games[a, b] / (strength[a] + strength[b]) for b in names if b != a)
+                updated[a] = total / weight if weight else strength[a]
+            # 全体の幾何平均を 1（レーティング ELO_INITIAL）に揃える
+            mean = math.exp(sum(math.log(value) for value in updated.values()) / len(names))
+            updated = {name: value / mean for name, value in updated.items()}
+            change = max(abs(updated[name] - strength[name]) for name in names)
+            strength = updated
+            if change < RATING_TOLERANCE:
+                break
+        return {name: ELO_INITIAL + 400 * math.log10(strength[name]) for name in names}
+
+    def format(self) -> str:
+        ratings = self.elo()
+        lines = [f"{'strategy':<12}{'elo':>8}{'win%':>8}{'W':>8}{'D':>8}{'L':>8}"]
+        for name in sorted(self.strategies, key=lambda n: ratings[n], reverse=True):
+            lines.append(f"{name:<12}{ratings[name]:>8.1f}{self.win_rate(name) * 100:>7.1f}%"
+                         f"{self.wins[name]:>8}{self.draws[name]:>8}{self.losses[name]:>8}")
+        return "\n".join(lines)
+
+def run_tournament(strategies: List[str], matches: int, seed: int = 0,
+                   workers: Optional[int] = None,
+                   shard_size: int = SHARD_SIZE) -> StandingsTable:
+    """全ての組み合わせで matches 試合ずつ対戦させる"""
+    table = StandingsTable(strategies)
+    shards = []
+    for strategy_a, strategy_b in itertools.combinations(strategies, 2):
+        for shard_index, start in enumerate(range(0, matches, shard_size)):
+            shards.append((len(shards), strategy_a, strategy_b,
+                           shard_seed(seed, strategy_a, strategy_b, shard_index),
+                           min(shard_size, matches - start)))
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_shard, *shard) for shard in shards]
+        # ワーカーが例外で落ちていれば future.result() がそのまま送出する
+        for future in as_completed(futures):
+            for result in future.result():
+                table.record(result)
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description="E CARD GAME の CPU 戦略の総当たり戦")
+    parser.add_argument("strategies", nargs="*", default=sorted(STRATEGIES),
+                        help=f"参加させる戦略 ({', '.join(sorted(STRATEGIES))})")
+    parser.add_argument("-n", "--matches", type=int, default=1000, help="1組あたりの試合数")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="ワーカープロセス数")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategy: {', '.join(unknown)}")
+    if len(args.strategies) < 2:
+        parser.error("at least two strategies are required")
+
+    table = run_tournament(args.strategies, args.matches, args.seed, args.workers)
+    print(table.format())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""カードの移動・裏返し・ポップアップのフェードのためのトゥイーン
+
+トゥイーンは固定数のスロットに配列で持ち（開始・終了位置、経過 tick、長さ、イージング）、
+開始してもフレームを進めても Python のオブジェクトを作らない。
+時間はゲームの tick（Game.step 1回）で数えるので、固定タイムステップや早送りでも同じ動きになる。
+"""
+
+from array import array
+
+DEFAULT_CAPACITY = 16  # 同時に動かせるトゥイーンの数（配るカード10枚 + 出したカード・ポップアップ）
+
+# イージングの種類
+LINEAR = 0
+EASE_OUT = 1  # 減速しながら止まる（カードのスライド）
+SMOOTH = 2    # ゆっくり始まりゆっくり止まる
+
+# 1段階ずつ暗くした色（pyxel の標準パレット）。FADE_LEVELS[n] は n 段階暗くした対応表
+_DARKER = (0, 0, 1, 1, 2, 1, 5, 6, 2, 4, 9, 3, 5, 1, 2, 4)
+FADE_LEVELS = [tuple(range(16))]
+for _ in range(3):
+    FADE_LEVELS.append(tuple(_DARKER[col] for col in FADE_LEVELS[-1]))
+
+class TweenPool:
+    """固定数のスロットに保持するトゥイーンの集まり
+
+    各トゥイーンは (kind, key) で識別する（kind は呼び出し側が決める種類、key はカードの位置など）。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.active = bytearray(capacity)
+        self.kind = bytearray(capacity)
+        self.key = array("i", bytes(4 * capacity))
+        self.ease = bytearray(capacity)
+        self.delay = array("H", bytes(2 * capacity))     # 動き始めるまでの tick 数
+        self.duration = array("H", bytes(2 * capacity))  # 動いている tick 数
+        self.elapsed = array("H", bytes(2 * capacity))
+        self.x0 = array("f", bytes(4 * capacity))
+        self.y0 = array("f", bytes(4 * capacity))
+        self.x1 = array("f", bytes(4 * capacity))
+        self.y1 = array("f", bytes(4 * capacity))
+        self.count = 0  # 動いているトゥイーンの数
+        self.version = 0  # 状態が変わるたびに増える（描き直しの判定用）
+
+    @property
+    def busy(self) -> bool:
+        return self.count > 0
+
+    def start(self, kind: int, key: int, x0: float, y0: float, x1: float, y1: float,
+              duration: int, delay: int = 0, ease: int = EASE_OUT) -> int:
+        """トゥイーンを開始してスロットの番号を返す（同じ kind, key のものは置き換える）
+
+        空きスロットが無いときは、最も終わりに近いトゥイーンを終わらせて使う。
+        """
+        slot = self.find(kind, key)
+        if slot < 0:
+            slot = self.active.find(0)
+        if slot < 0:
+            slot = max(range(self.capacity),
+                       key=lambda i: self.elapsed[i] - self.delay[i] - self.duration[i])
+        if not self.active[slot]:
+            self.count += 1
+        self.version += 1
+        self.active[slot] = 1
+        self.kind[slot] = kind
+        self.key[slot] = key
+        self.ease[slot] = ease
+        self.delay[slot] = delay
+        self.duration[slot] = max(1, duration)
+        self.elapsed[slot] = 0
+        self.x0[slot] = x0
+        self.y0[slot] = y0
+        self.x1[slot] = x1
+        self.y1[slot] = y1
+        return slot
+
+    def find(self, kind: int, key: int) -> int:
+        """動いているトゥイーンのスロット（無ければ -1）"""
+        if not self.count:
+            return -1
+        for slot in range(self.capacity):
+            if self.active[slot] and self.kind[slot] == kind and self.key[slot] == key:
+                return slot
+        return -1
+
+    def update(self):
+        """1 tick 進める（終わったトゥイーンのスロットを空ける）"""
+        if not self.count:
+            return
+        self.version += 1
+        for slot in range(self.capacity):
+            if self.active[slot]:
+                self.elapsed[slot] += 1
+                if self.elapsed[slot] >= self.delay[slot] + self.duration[slot]:
+                    self.active[slot] = 0
+                    self.count -= 1
+
+    def clear(self):
+        for slot in range(self.capacity):
+            self.active[slot] = 0
+        self.count = 0
+        self.version += 1
+
+    def started(self, slot: int) -> bool:
+        return self.elapsed[slot] >= self.delay[slot]
+
+    def progress(self, slot: int) -> float:
+        """イージングを適用した進み具合（開始前は 0、終了時は 1）"""
+        t = (self.elapsed[slot] - self.delay[slot]) / self.duration[slot]
+        if t <= 0.0:
+            return 0.0
+        if t >= 1.0:
+            return 1.0
+        ease = self.ease[slot]
+        if ease == EASE_OUT:
+            return 1.0 - (1.0 - t) * (1.0 - t)
+        if ease == SMOOTH:
+            return t * t * (3.0 - 2.0 * t)
+        return t
+
+    def x(self, slot: int) -> float:
+        return self.x0[slot] + (self.x1[slot] - self.x0[slot]) * self.progress(slot)
+
+    def y(self, slot: int) -> float:
+        return self.y0[slot] + (self.y1[slot] - self.y0[slot]) * self.progress(slot)
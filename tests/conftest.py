@@ -0,0 +1,5 @@
+import os
+import sys
+
+# ゲームのモジュールは src 直下にあり、python src/main.py と同じく src から import する
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
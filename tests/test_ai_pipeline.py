@@ -0,0 +1,35 @@
+import logging
+from ai_pipeline import AIMovePipeline
+from card import CardType
+from hand import Hand
+from player import AIPlayer
+
+class BrokenAIPlayer(AIPlayer):
+    def choose_card_index(self) -> int:
+        raise RuntimeError("search failed")
+
+def player(cls=AIPlayer) -> AIPlayer:
+    ai_player = cls("CPU")
+    ai_player.hand = Hand.from_types([CardType.SLAVE] + [CardType.CITIZEN] * 4)
+    return ai_player
+
+def test_poll_returns_worker_move():
+    pipeline = AIMovePipeline()
+    try:
+        pipeline.start(player())
+        index = pipeline.wait()
+        assert 0 <= index < 5
+        assert not pipeline.used_fallback
+    finally:
+        pipeline.shutdown()
+
+def test_failed_worker_is_logged_and_falls_back(caplog):
+    pipeline = AIMovePipeline(fallback=lambda ai_player: 0)
+    try:
+        pipeline.start(player(BrokenAIPlayer))
+        with caplog.at_level(logging.ERROR, logger="ai_pipeline"):
+            assert pipeline.wait() == 0
+        assert pipeline.used_fallback
+        assert "search failed" in caplog.text
+    finally:
+        pipeline.shutdown()
@@ -0,0 +1,108 @@
+import pytest
+from card import CardType
+from engine import MatchEngine, simulate_match
+from player import Player, AIPlayer, PlayerType
+
+IDENTITY = (0, 1, 2, 3, 4)  # 特殊カードが先頭、続けて市民4枚
+
+def start_engine(deals=None) -> MatchEngine:
+    """手札を記録どおりの並び順で配った対戦（既定では全バトル特殊カードが先頭）"""
+    engine = MatchEngine()
+    if deals is None:
+        deals = [IDENTITY] * (2 * engine.total_battles)
+    engine.start(Player("Player 1", PlayerType.HUMAN), AIPlayer("CPU"), deals=deals)
+    return engine
+
+def test_start_deals_emperor_to_player():
+    engine = start_engine()
+    assert engine.player.hand.counts == (1, 4, 0)
+    assert engine.ai_player.hand.counts == (0, 4, 1)
+    assert engine.player.hand.type_at(0) == CardType.EMPEROR
+    assert engine.record.deals == [IDENTITY, IDENTITY]
+
+def test_play_card_draw_then_win():
+    engine = start_engine()
+    assert engine.play_card(1, 1) == "draw"  # 市民 vs 市民
+    assert engine.round == 2
+    assert engine.battle_result is None
+    assert len(engine.player.hand) == len(engine.ai_player.hand) == 4
+
+    assert engine.play_card(0, 1) == "win"  # 皇帝 vs 市民
+    assert engine.battle_result == "win"
+    assert (engine.player.score, engine.ai_player.score) == (1, 0)
+    assert engine.record.moves == [(1, 1), (0, 1)]
+    assert engine.played_cards_history[-1][0].card_type == CardType.EMPEROR
+
+def test_play_card_lose():
+    engine = start_engine()
+    assert engine.play_card(0, 0) == "lose"  # 皇帝 vs 奴隷
+    assert engine.battle_result == "lose"
+    assert (engine.player.score, engine.ai_player.score) == (0, 1)
+
+def test_play_card_out_of_range_is_ignored():
+    engine = start_engine()
+    assert engine.play_card(5, 0) is None
+    assert engine.play_card(-1, 0) is None
+    assert engine.record.moves == []
+    assert len(engine.player.hand) == len(engine.ai_player.hand) == 5
+
+def test_play_card_out_of_range_cpu_index_is_ignored():
+    engine = start_engine()
+    assert engine.play_card(0, 5) is None
+    assert engine.play_card(0, -1) is None
+    assert engine.record.moves == []
+    assert engine.played_cards_history == []
+    assert len(engine.player.hand) == len(engine.ai_player.hand) == 5
+
+def test_next_battle_swaps_sides():
+    engine = start_engine()
+    engine.play_card(0, 1)
+    assert engine.next_battle()
+    assert not engine.player_is_emperor
+    assert engine.round == 1
+    assert engine.current_battle == 2
+    assert engine.player.hand.counts == (0, 4, 1)
+    assert engine.ai_player.hand.counts == (1, 4, 0)
+
+def test_last_battle_finishes_match():
+    engine = start_engine()
+    for battle in range(engine.total_battles):
+        engine.play_card(0, 0)  # 皇帝 vs 奴隷 / 奴隷 vs 皇帝
+        assert engine.next_battle() == (battle + 1 < engine.total_battles)
+    assert engine.finished
+    # 皇帝側のときは負け、奴隷側のときは勝つ
+    assert (engine.player.score, engine.ai_player.score) == (3, 3)
+
+def test_start_resets_counters():
+    engine = start_engine()
+    engine.play_card(1, 1)
+    engine.play_card(0, 1)
+    engine.next_battle()
+    engine.play_card(0, 1)
+
+    engine.start(engine.player, engine.ai_player, seed=7)
+    assert (engine.player.score, engine.ai_player.score) == (0, 0)
+    assert (engine.round, engine.current_battle) == (1, 1)
+    assert engine.player_is_emperor
+    assert not engine.finished
+    assert engine.battle_result is None
+    assert engine.played_cards_history == []
+    assert engine.record.seed == 7
+    assert engine.record.moves == []
+    assert len(engine.record.deals) == 2
+    assert len(engine.player.hand) == len(engine.ai_player.hand) == 5
+
+def test_missing_deal_raises():
+    engine = start_engine(deals=[IDENTITY, IDENTITY])
+    engine.play_card(0, 1)
+    with pytest.raises(ValueError, match="battle 2"):
+        engine.next_battle()
+
+def test_simulate_match_is_deterministic():
+    first = simulate_match(seed=42)
+    second = simulate_match(seed=42)
+    assert first.finished
+    assert first.record.deals == second.record.deals
+    assert first.record.moves == second.record.moves
+    assert (first.player.score, first.ai_player.score) == \
+        (second.player.score, second.ai_player.score)
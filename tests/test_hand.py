@@ -0,0 +1,76 @@
+import pytest
+from card import Card, CardType
+from hand import Hand, MAX_CARDS
+
+E, C, S = CardType.EMPEROR, CardType.CITIZEN, CardType.SLAVE
+
+def test_from_types_keeps_order():
+    hand = Hand.from_types([C, E, C, S])
+    assert len(hand) == 4
+    assert list(hand.types()) == [C, E, C, S]
+    assert [card.card_type for card in hand] == [C, E, C, S]
+    assert hand[1].card_type == E
+    assert hand.counts == (1, 2, 1)
+
+def test_from_cards_matches_from_types():
+    assert Hand.from_cards([Card(S), Card(C)]) == Hand.from_types([S, C])
+
+def test_empty_hand():
+    hand = Hand()
+    assert len(hand) == 0
+    assert list(hand) == []
+    assert hand.legal_moves() == ()
+
+def test_too_many_cards():
+    Hand.from_types([C] * MAX_CARDS)
+    with pytest.raises(ValueError):
+        Hand.from_types([C] * (MAX_CARDS + 1))
+
+def test_index():
+    hand = Hand.from_types([C, C, E, C])
+    assert hand.index(C) == 0
+    assert hand.index(E) == 2
+    assert hand.indices_of(C) == [0, 1, 3]
+    with pytest.raises(ValueError):
+        hand.index(S)
+
+def test_remove_at():
+    hand = Hand.from_types([E, C, C, S, C])
+    assert hand.remove_at(0) == Hand.from_types([C, C, S, C])
+    assert hand.remove_at(3) == Hand.from_types([E, C, C, C])
+    assert hand.remove_at(4) == Hand.from_types([E, C, C, S])
+    assert hand.remove_at(3).counts == (1, 3, 0)
+    # 元の手札は変わらない
+    assert hand == Hand.from_types([E, C, C, S, C])
+
+def test_remove_takes_first_of_type():
+    hand = Hand.from_types([S, C, E, C])
+    assert hand.remove(C) == Hand.from_types([S, E, C])
+    assert hand.remove(E) == Hand.from_types([S, C, C])
+    with pytest.raises(ValueError):
+        Hand.from_types([C]).remove(S)
+
+def test_remove_down_to_empty():
+    hand = Hand.from_types([E, C])
+    assert hand.remove_at(0).remove_at(0) == Hand()
+
+@pytest.mark.parametrize("index", [-1, 4, 5])
+def test_out_of_range(index):
+    hand = Hand.from_types([E, C, C, C])
+    with pytest.raises(IndexError):
+        hand.type_at(index)
+    with pytest.raises(IndexError):
+        hand[index]
+    with pytest.raises(IndexError):
+        hand.remove_at(index)
+
+def test_legal_moves_are_unique():
+    assert Hand.from_types([C, C, E, C]).legal_moves() == (E, C)
+    assert Hand.from_types([C, C]).legal_moves() == (C,)
+
+def test_equal_hands_hash_alike():
+    first = Hand.from_types([E, C, C])
+    second = Hand.from_types([C, E, C])
+    assert first != second
+    assert first.counts_key == second.counts_key
+    assert {first: 1}[Hand.from_types([E, C, C])] == 1
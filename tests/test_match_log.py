@@ -0,0 +1,110 @@
+import pytest
+from engine import MatchEngine, simulate_match
+from match_log import MatchRecord, MAX_SEED
+from player import Player, AIPlayer, PlayerType
+from replay import replay_match
+
+def first_decided_turn(record: MatchRecord) -> int:
+    """記録の中で最初のバトルが決着したターンの番号（0 始まり）"""
+    engine = MatchEngine(record.total_battles)
+    engine.start(Player("Player 1", PlayerType.HUMAN), AIPlayer("CPU"), deals=record.deals)
+    for i, move in enumerate(record.moves):
+        engine.play_card(*move)
+        if engine.battle_result is not None:
+            return i
+    raise AssertionError("no battle was decided")
+
+def cut_after_first_battle(record: MatchRecord) -> MatchRecord:
+    """最初のバトルの決着直後に終わった記録（次の配布の前にゲームを閉じた場合）"""
+    cut = MatchRecord(record.seed, record.total_battles)
+    cut.deals = record.deals[:2]
+    cut.moves = record.moves[:first_decided_turn(record) + 1]
+    return cut
+
+@pytest.mark.parametrize("seed", [0, 1, 2**63 + 5])
+def test_bytes_round_trip(seed):
+    record = simulate_match(seed).record
+    loaded = MatchRecord.from_bytes(record.to_bytes())
+    assert loaded.seed == seed
+    assert loaded.total_battles == record.total_battles
+    assert loaded.deals == record.deals
+    assert loaded.moves == record.moves
+
+def test_round_trip_without_seed():
+    record = MatchRecord(None, 6)
+    record.deals = [(4, 3, 2, 1, 0)]
+    record.moves = [(3, 0)]
+    loaded = MatchRecord.from_bytes(record.to_bytes())
+    assert loaded.seed is None
+    assert (loaded.deals, loaded.moves) == (record.deals, record.moves)
+
+def test_largest_seed_round_trips():
+    record = MatchRecord(MAX_SEED, 6)
+    assert MatchRecord.from_bytes(record.to_bytes()).seed == MAX_SEED
+
+@pytest.mark.parametrize("seed", [-1, MAX_SEED + 1])
+def test_out_of_range_seed_is_rejected(seed):
+    with pytest.raises(ValueError, match="does not fit"):
+        MatchRecord(seed, 6).to_bytes()
+
+def test_save_and_load(tmp_path):
+    record = simulate_match(3).record
+    path = tmp_path / "match.ecr"
+    record.save(str(path))
+    loaded = MatchRecord.load(str(path))
+    assert (loaded.deals, loaded.moves) == (record.deals, record.moves)
+
+def test_from_bytes_rejects_bad_data():
+    data = simulate_match(4).record.to_bytes()
+    with pytest.raises(ValueError):
+        MatchRecord.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        MatchRecord.from_bytes(data[:5])
+    with pytest.raises(ValueError):
+        MatchRecord.from_bytes(b"XXXX" + data[4:])
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_reproduces_match(seed):
+    original = simulate_match(seed)
+    replayed = replay_match(MatchRecord.from_bytes(original.record.to_bytes()))
+    assert replayed.finished
+    assert (replayed.player.score, replayed.ai_player.score) == \
+        (original.player.score, original.ai_player.score)
+    assert replayed.record.deals == original.record.deals
+    assert replayed.record.moves == original.record.moves
+
+def test_replay_record_cut_after_decided_battle():
+    record = cut_after_first_battle(simulate_match(5).record)
+    engine = replay_match(MatchRecord.from_bytes(record.to_bytes()))
+    assert not engine.finished
+    assert engine.current_battle == 1
+    assert engine.battle_result is not None
+    assert engine.player.score + engine.ai_player.score == 1
+    # 記録に次の配布が無いので、そのまま次の戦へは進めない
+    with pytest.raises(ValueError, match="no deal"):
+        engine.next_battle()
+
+def test_replay_record_cut_mid_battle():
+    record = simulate_match(6).record
+    record.moves = record.moves[:first_decided_turn(record)]
+    engine = replay_match(record)
+    assert engine.battle_result is None
+    assert engine.round == len(record.moves) + 1
+
+def test_replay_rejects_invalid_move():
+    record = simulate_match(7).record
+    record.moves[0] = (9, 0)
+    with pytest.raises(ValueError, match="invalid move"):
+        replay_match(record)
+
+def test_replay_rejects_invalid_cpu_move():
+    record = simulate_match(7).record
+    record.moves[0] = (record.moves[0][0], 9)
+    with pytest.raises(ValueError, match="invalid move at turn 1"):
+        replay_match(record)
+
+def test_replay_rejects_moves_after_end():
+    record = simulate_match(8).record
+    record.moves.append((0, 0))
+    with pytest.raises(ValueError, match="after the end"):
+        replay_match(record)
@@ -0,0 +1,47 @@
+from timestep import FixedTimestep, MAX_FRAME_SKIP
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_advance_accumulates_time():
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate=30, clock=clock)
+    assert timestep.advance() == 1  # 最初のフレーム
+    clock.now += 0.5 / 30
+    assert timestep.advance() == 0
+    clock.now += 0.6 / 30
+    assert timestep.advance() == 1
+    assert 0.0 <= timestep.alpha < 1.0
+
+def test_time_scale_advances_faster():
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate=30, time_scale=4.0, clock=clock)
+    timestep.advance()
+    clock.now += 1 / 30
+    assert timestep.advance() == 4
+
+def test_lag_is_capped():
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate=30, max_ticks_per_frame=10, clock=clock)
+    timestep.advance()
+    clock.now += 60.0
+    assert timestep.advance() == 10
+    assert timestep.alpha == 0.0
+
+def test_draw_within_frame_is_not_skipped_at_any_time_scale():
+    for time_scale in (0.5, 1.0, 4.0, 16.0):
+        timestep = FixedTimestep(time_scale=time_scale, frame_rate=30)
+        timestep.draw_finished(0.9 / 30)
+        assert timestep.should_draw()
+
+def test_slow_draw_skips_a_limited_number_of_frames():
+    timestep = FixedTimestep(frame_rate=30)
+    timestep.draw_finished(10.0)
+    skipped = 0
+    while not timestep.should_draw():
+        skipped += 1
+    assert skipped == MAX_FRAME_SKIP
@@ -0,0 +1,49 @@
+import random
+from tournament import StandingsTable, ELO_INITIAL, play_shard, run_tournament
+
+def results():
+    """a は b に勝ち越し、b は c に勝ち越し、c は a と互角"""
+    games = []
+    for i in range(30):
+        games.append((0, i, "a", "b", 3, 2) if i % 3 else (0, i, "a", "b", 2, 3))
+        games.append((1, i, "b", "c", 3, 2) if i % 3 else (1, i, "b", "c", 3, 3))
+        games.append((2, i, "a", "c", 3, 2) if i % 2 else (2, i, "a", "c", 2, 3))
+    return games
+
+def standings(games) -> StandingsTable:
+    table = StandingsTable(["a", "b", "c"])
+    for game in games:
+        table.record(game)
+    return table
+
+def test_rating_does_not_depend_on_order():
+    games = results()
+    expected = standings(games).elo()
+    for seed in range(5):
+        shuffled = list(games)
+        random.Random(seed).shuffle(shuffled)
+        ratings = standings(shuffled).elo()
+        for name in expected:
+            assert abs(ratings[name] - expected[name]) < 1e-6
+
+def test_rating_follows_win_rate():
+    table = standings(results())
+    ratings = table.elo()
+    by_rating = sorted(table.strategies, key=ratings.get, reverse=True)
+    by_win_rate = sorted(table.strategies, key=table.win_rate, reverse=True)
+    assert by_rating == by_win_rate
+    # 平均的な強さが ELO_INITIAL になる
+    assert abs(sum(ratings.values()) / 3 - ELO_INITIAL) < 50
+
+def test_unbeaten_rating_is_finite():
+    table = standings([(0, i, "a", "b", 3, 0) for i in range(10)])
+    ratings = table.elo()
+    assert ratings["b"] < ratings["a"] < ELO_INITIAL + 2000
+
+def test_play_shard_is_deterministic():
+    assert play_shard(0, "basic", "random", 1, 6) == play_shard(0, "basic", "random", 1, 6)
+
+def test_run_tournament_counts_every_match():
+    table = run_tournament(["basic", "random"], matches=7, seed=1, workers=1, shard_size=3)
+    assert len(table.results) == 7
+    assert table.games("basic") == table.games("random") == 7